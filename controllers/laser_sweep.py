@@ -4,56 +4,92 @@ laser_sweep.py
 Handles sweeping the tunable laser using Agilent 8164.
 """
 from instruments.laser_base import BaseLaserSource
+from utils.sweep import make_axis, sweep_points
 from tqdm import tqdm
 import numpy as np
 import time
-from typing import List, Tuple
+from typing import Tuple
 
 def perform_laser_sweep(
     laser: BaseLaserSource,
-    start_wl: float = 1.549,
-    stop_wl: float = 1.551,
+    start_wl: float = 1549.0,
+    stop_wl: float = 1551.0,
     step: float = 0.01,
     delay: float = 0.1,
-    logger=None
-) -> Tuple[Tuple[str, str], List[Tuple[float, float]]]:
+    logger=None,
+    use_hardware_sweep: bool = True,
+    log_every_n: int = 1,
+    avg_time: float = 1e-4,
+    speed: float = 0.5
+) -> Tuple[Tuple[str, str], np.ndarray]:
     """
     Sweep the laser wavelength from `start_wl` to `stop_wl` in steps of `step` nm.
 
     For each wavelength, set the laser, measure the output power, and optionally log the result.
-    Progress is shown with a progress bar. Returns a tuple containing column headers and a list
-    of (wavelength, power) measurement tuples.
+    Progress is shown with a progress bar. Returns a tuple containing column headers and an
+    (N, 2) array of (wavelength, power) rows.
 
     Args:
         laser (BaseLaser): Laser instrument object.
         start_wl (float): Starting wavelength in nm.
         stop_wl (float): Ending wavelength in nm.
         step (float): Wavelength increment in nm.
-        delay (float): Delay in seconds between measurements.
+        delay (float): Delay in seconds between measurements of the point-by-point sweep.
+            Unused with the hardware sweep, whose timing is set by `speed` and `avg_time`.
         logger (optional): Logger for measurement info.
+        log_every_n (int): Only log every n-th measurement, to keep long sweeps quiet.
+        use_hardware_sweep (bool): Use the laser's logged continuous sweep instead of
+            stepping the wavelength point by point from Python.
+        avg_time (float): Power meter averaging time per sample in seconds (hardware sweep only).
+        speed (float): Sweep speed in nm/s (hardware sweep only). Must be supported by the laser module.
 
     Returns:
-        Tuple[Tuple[str, str], List[Tuple[float, float]]]: 
+        Tuple[Tuple[str, str], np.ndarray]: 
             - Column headers ("Wavelength (nm)", "Power (dBm)")
-            - List of (wavelength, power) tuples.
+            - (N, 2) array of (wavelength, power) rows. Use `results.tolist()` for plain lists.
 
     Raises:
         Exception: Propagates exceptions from laser control or measurement.
     """
     try:
         laser.initialize()
-        results = []
-        wavelengths = np.arange(start_wl, stop_wl + step / 2, step)
-        pbar = tqdm(total=len(wavelengths), desc=f"Sweeping {start_wl:.3f} → {stop_wl:.3f} nm", unit="nm")
-        
-        for wl in wavelengths:
-            laser.set_wavelength(wl)
-            power = laser.measure_power()
+
+        if use_hardware_sweep:
+            num_points = sweep_points(start_wl, stop_wl, step)
+            pbar = tqdm(total=num_points, desc=f"Sweeping {start_wl:.3f} → {stop_wl:.3f} nm", unit="nm")
+            powers = laser.sweep_wavelength_logged(start_wl, stop_wl, step, avg_time=avg_time, speed=speed)
+            # Label each sample with the wavelength of the step that triggered it
+            wavelengths = start_wl + np.copysign(abs(step), stop_wl - start_wl) * np.arange(len(powers))
+            results = np.column_stack((wavelengths, powers))
+
             if logger:
-                logger.info(f"Wavelength: {wl:.3f} nm, Power: {power:.3f} dBm")
-            results.append((wl, power))
+                for wl, power in results[::log_every_n]:
+                    logger.info("Wavelength: %.3f nm, Power: %.3f dBm", wl, power)
+
+            pbar.update(len(results))
+            pbar.close()
+            return ("Wavelength (nm)", "Power (dBm)"), results
+
+        wavelengths = make_axis(start_wl, stop_wl, step)
+        results = np.empty((len(wavelengths), 2))
+        results[:, 0] = wavelengths
+        pbar = tqdm(total=len(wavelengths), desc=f"Sweeping {start_wl:.3f} → {stop_wl:.3f} nm", unit="nm",
+                    miniters=max(1, len(wavelengths) // 200), mininterval=0.1)
+
+        # Bind the per-point calls once, outside the hot loop
+        set_wavelength = laser.set_wavelength
+        measure_power = laser.measure_power
+        log = logger.info if logger else None
+        update = pbar.update
+        
+        for i, wl in enumerate(wavelengths):
+            set_wavelength(wl)
+            power = measure_power()
+            if log and i % log_every_n == 0:
+                log("Wavelength: %.3f nm, Power: %.3f dBm", wl, power)
+            results[i, 1] = power
             time.sleep(delay)
-            pbar.update(1)
+            update(1)
 
 
         pbar.close()
@@ -6,10 +6,41 @@ Handles sweeping the sourcemeter voltage
 from instruments.sourcemeter_base import BaseSourceMeter
 from instruments.power_base import BasePowerMeter
 from instruments.laser_base import BaseLaserSource
+from utils.sweep import make_axis
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 import numpy as np
 import time
-from typing import List, Tuple
+from typing import Tuple
+
+
+def _on_separate_buses(*instruments) -> bool:
+    """Return True if every instrument talks over its own VISA interface (type and board)."""
+    try:
+        buses = {(inst.main.interface_type, inst.main.interface_number) for inst in instruments}
+    except Exception:
+        return False
+    return len(buses) == len(instruments)
+
+
+def _read_electrical_and_optical(set_and_read, measure_power, level, settle, executor=None):
+    """
+    Set a source level and return the source meter and power meter readings at that level.
+
+    Without an executor the reads are serialized and `settle` is waited after the source
+    meter reading. With an executor the source meter transaction runs in a worker thread
+    while the power meter waits out `settle` from the level change and then reads, so the
+    two bus transactions overlap.
+    """
+    if executor is None:
+        electrical = set_and_read(level)
+        time.sleep(settle)
+        return electrical, measure_power()
+
+    future = executor.submit(set_and_read, level)
+    time.sleep(settle)
+    optical = measure_power()
+    return future.result(), optical
 
 
 def measure_iv_curve(
@@ -21,8 +52,10 @@ def measure_iv_curve(
     current_limit: float = 0.01,
     wire_mode: int = 2,
     delay: float = 0.1,
-    logger=None
-) -> Tuple[Tuple[str, str], List[Tuple[float, float]]]:
+    logger=None,
+    use_hardware_sweep: bool = True,
+    log_every_n: int = 1
+) -> Tuple[Tuple[str, str], np.ndarray]:
 
     try:
         if not sourcemeter.connected:
@@ -30,26 +63,59 @@ def measure_iv_curve(
     
     
         sourcemeter.initialize(wire_mode=wire_mode)
-        results = []
-        voltages = np.arange(start_v, stop_v + step, step)
-        pbar = tqdm(total=len(voltages), desc=f"Sweeping {start_v:.3f} → {stop_v:.3f} V", unit="V")
+        voltages = make_axis(start_v, stop_v, step)
+
+        # Sweeps the instrument cannot run itself (no support, or too long) use the per-point loop below
+        max_points = sourcemeter.MAX_SWEEP_POINTS
+        if use_hardware_sweep and 0 < max_points < len(voltages) and logger:
+            logger.info("%d-point sweep exceeds the %d-point hardware sweep; stepping point by point.",
+                        len(voltages), max_points)
+        if use_hardware_sweep and len(voltages) <= max_points:
+            # The instrument steps through the staircase itself; one read returns every point
+            pbar = tqdm(total=len(voltages), desc=f"Sweeping {start_v:.3f} → {stop_v:.3f} V", unit="V")
+            currents = sourcemeter.sweep_voltage_linear(start=start_v,
+                stop=stop_v,
+                step=step,
+                compliance=current_limit,
+                measure_range=measure_current_range,
+                delay=delay
+            )
+            results = np.column_stack((voltages, currents))
 
+            if logger:
+                for v, read_current in results[::log_every_n]:
+                    logger.info("Voltage: %.3f V, Current: %.3e A", v, read_current)
+
+            pbar.update(len(results))
+            pbar.close()
+
+            return (("Voltage (V)", "Current (A)"), results)
+
+        results = np.empty((len(voltages), 2))
+        pbar = tqdm(total=len(voltages), desc=f"Sweeping {start_v:.3f} → {stop_v:.3f} V", unit="V",
+                    miniters=max(1, len(voltages) // 200), mininterval=0.1)
+
+        sourcemeter.configure_voltage_source(source_range=np.abs(stop_v - start_v) + np.abs(step),
+            compliance=current_limit,
+            measure_range=measure_current_range,
+            wire_mode=wire_mode,
+            delay=delay
+        )
+        # Bind the per-point calls once, outside the hot loop
+        set_and_read = sourcemeter.set_voltage_and_read
+        log = logger.info if logger else None
+        update = pbar.update
         
         for i, v in enumerate(voltages):
             
-            read_current = sourcemeter.source_voltage_and_read_current(source_voltage_level=v,
-                source_voltage_range=np.abs(stop_v - start_v) + np.abs(step),
-                measure_current_range=measure_current_range,  # Adjust as needed
-                current_limit=current_limit,  # Adjust as needed
-                delay=delay
-           )
+            read_current = set_and_read(v)
             
-            if logger:
-                logger.info(f"Voltage: {v:.3f} V, Current: {read_current:.3f} A")
-            results.append((v, read_current))
+            if log and i % log_every_n == 0:
+                log("Voltage: %.3f V, Current: %.3e A", v, read_current)
+            results[i] = v, read_current
             
 
-            pbar.update(1)
+            update(1)
 
         pbar.close()
 
@@ -72,9 +138,12 @@ def measure_liv_curve(
     center_wavelength: float = 1550.0,  # Wavelength in nm
     sourcemeter_delay: float = 0.1,
     powermeter_delay: float = 0.1,
-    logger=None
-) -> Tuple[Tuple[str, str, str], List[Tuple[float, float, float]]]:
+    logger=None,
+    overlap_reads: bool = True,
+    log_every_n: int = 1
+) -> Tuple[Tuple[str, str, str], np.ndarray]:
 
+    executor = None
     try:
         if not sourcemeter.connected:
             raise RuntimeError("Cannot perform sweep: Instrument not connected.")
@@ -88,33 +157,48 @@ def measure_liv_curve(
         laser.initialize()
         laser.set_wavelength(center_wavelength)  # Set wavelength to 1550 nm, adjust as needed
         # powermeter.initialize()
-        results = []
-        voltages = np.arange(start_v, stop_v + step, step)
-        pbar = tqdm(total=len(voltages), desc=f"Sweeping {start_v:.3f} → {stop_v:.3f} V", unit="V")
+        voltages = make_axis(start_v, stop_v, step)
+        results = np.empty((len(voltages), 3))
+        pbar = tqdm(total=len(voltages), desc=f"Sweeping {start_v:.3f} → {stop_v:.3f} V", unit="V",
+                    miniters=max(1, len(voltages) // 200), mininterval=0.1)
 
+        sourcemeter.configure_voltage_source(source_range=np.abs(stop_v - start_v) + np.abs(step),
+            compliance=current_limit,
+            measure_range=measure_current_range,
+            wire_mode=wire_mode,
+            delay=sourcemeter_delay
+        )
+        # Instruments sharing a GPIB bus cannot talk at the same time, so only overlap across buses
+        if overlap_reads and _on_separate_buses(sourcemeter, powermeter):
+            executor = ThreadPoolExecutor(max_workers=1)
+            settle = sourcemeter_delay + powermeter_delay
+        else:
+            settle = powermeter_delay
+        # Bind the per-point calls once, outside the hot loop
+        set_and_read = sourcemeter.set_voltage_and_read
+        measure_power = powermeter.measure_power_fast
+        log = logger.info if logger else None
+        update = pbar.update
         
         for i, v in enumerate(voltages):
             
-            read_current = sourcemeter.source_voltage_and_read_current(source_voltage_level=v,
-                source_voltage_range=np.abs(stop_v - start_v) + np.abs(step),
-                measure_current_range=measure_current_range,  # Adjust as needed
-                current_limit=current_limit,  # Adjust as needed
-                delay=sourcemeter_delay
-           )
-            time.sleep(powermeter_delay)
-            read_optical_power = powermeter.measure_power()  # Measure optical power
+            read_current, read_optical_power = _read_electrical_and_optical(
+                set_and_read, measure_power, v, settle, executor
+            )
             
-            if logger:
-                logger.info(f"Voltage: {v:.3f} V, Current: {read_current:.3f} A, Optical Power: {read_optical_power:.3f} dBm")
-            results.append((v, read_current, read_optical_power))
+            if log and i % log_every_n == 0:
+                log("Voltage: %.3f V, Current: %.3e A, Optical Power: %.3f dBm", v, read_current, read_optical_power)
+            results[i] = v, read_current, read_optical_power
             
 
-            pbar.update(1)
+            update(1)
 
         pbar.close()
 
         return (("Voltage (V)", "Current (A)", "Optical Power (dBm)"), results)
     finally:
+        if executor:
+            executor.shutdown()
         sourcemeter.turn_off()
         
         
@@ -131,9 +215,12 @@ def measure_laser_liv_curve_by_source_current(
     center_wavelength: float = 1550.0,  # Wavelength in nm
     sourcemeter_delay: float = 0.1,
     powermeter_delay: float = 0.1,
-    logger=None
-) -> Tuple[Tuple[str, str, str], List[Tuple[float, float, float]]]:
+    logger=None,
+    overlap_reads: bool = True,
+    log_every_n: int = 1
+) -> Tuple[Tuple[str, str, str], np.ndarray]:
 
+    executor = None
     try:
         if not sourcemeter.connected:
             raise RuntimeError("Cannot perform sweep: Instrument not connected.")
@@ -144,30 +231,45 @@ def measure_laser_liv_curve_by_source_current(
         sourcemeter.initialize(wire_mode=wire_mode)
         powermeter.initialize()
         # laser.set_wavelength(center_wavelength)  # Set wavelength to 1550 nm, adjust as needed
-        results = []
-        currents = np.arange(start_current, stop_current + step_current, step_current)
-        pbar = tqdm(total=len(currents), desc=f"Sweeping {start_current:.3f} → {stop_current:.3f} A", unit="A")
+        currents = make_axis(start_current, stop_current, step_current)
+        results = np.empty((len(currents), 3))
+        pbar = tqdm(total=len(currents), desc=f"Sweeping {start_current:.3f} → {stop_current:.3f} A", unit="A",
+                    miniters=max(1, len(currents) // 200), mininterval=0.1)
 
+        sourcemeter.configure_current_source(source_range=np.abs(stop_current - start_current) + np.abs(step_current),
+            compliance=voltage_limit,
+            measure_range=measure_voltage_range,
+            wire_mode=wire_mode,
+            delay=sourcemeter_delay
+        )
+        # Instruments sharing a GPIB bus cannot talk at the same time, so only overlap across buses
+        if overlap_reads and _on_separate_buses(sourcemeter, powermeter):
+            executor = ThreadPoolExecutor(max_workers=1)
+            settle = sourcemeter_delay + powermeter_delay
+        else:
+            settle = powermeter_delay
+        # Bind the per-point calls once, outside the hot loop
+        set_and_read = sourcemeter.set_current_and_read
+        measure_power = powermeter.measure_power_fast
+        log = logger.info if logger else None
+        update = pbar.update
         
         for i, cur in enumerate(currents):
             
-            read_voltage = sourcemeter.source_current_and_read_voltage(source_current_level=cur,
-                source_current_range=np.abs(stop_current - start_current) + np.abs(step_current),
-                measure_voltage_range=measure_voltage_range,  # Adjust as needed
-                voltage_limit=voltage_limit,  # Adjust as needed
-                delay=sourcemeter_delay
-           )
-            time.sleep(powermeter_delay)
-            read_optical_power = powermeter.measure_power()  # Measure optical power
+            read_voltage, read_optical_power = _read_electrical_and_optical(
+                set_and_read, measure_power, cur, settle, executor
+            )
             
-            if logger:
-                logger.info(f"Voltage: {read_voltage:.3f} V, Current: {cur:.3f} A, Optical Power: {read_optical_power:.3f} dBm")
-            results.append((read_voltage, cur, read_optical_power))
+            if log and i % log_every_n == 0:
+                log("Voltage: %.3f V, Current: %.3e A, Optical Power: %.3f dBm", read_voltage, cur, read_optical_power)
+            results[i] = read_voltage, cur, read_optical_power
 
-            pbar.update(1)
+            update(1)
 
         pbar.close()
 
         return (("Voltage (V)", "Current (A)", "Optical Power (dBm)"), results)
     finally:
+        if executor:
+            executor.shutdown()
         sourcemeter.turn_off()
@@ -0,0 +1,29 @@
+"""
+Process-wide default VISA resource manager.
+
+Opening a ResourceManager loads and scans the VISA library, which can take
+seconds on some backends, so drivers created without an explicit manager
+share a single lazily created instance.
+"""
+import atexit
+import functools
+
+import pyvisa as visa
+
+
+@functools.lru_cache(maxsize=None)
+def default_rm() -> visa.ResourceManager:
+    """Return the shared ResourceManager, creating it on first use."""
+    return visa.ResourceManager()
+
+
+def _close_default_rm():
+    if default_rm.cache_info().currsize:
+        try:
+            default_rm().close()
+        except visa.VisaIOError:
+            pass
+        default_rm.cache_clear()
+
+
+atexit.register(_close_default_rm)
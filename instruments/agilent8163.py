@@ -7,13 +7,17 @@ This instrument contains two main modules:
 
 Author: Georgios Charalampous
 Created: 2025-06-01
-Dependencies: pyvisa
+Dependencies: pyvisa, numpy
 """
+from instruments._rm import default_rm
 from instruments.scpi_instrument import SCPIInstrument
 from instruments.laser_base import BaseLaserSource
 from instruments.power_base import BasePowerMeter
 from utils.logger import setup_logger
+import functools
+import numpy as np
 import pyvisa as visa
+import time
 
 logger = setup_logger(__name__)
 
@@ -25,6 +29,9 @@ class Agilent8163Multimeter(SCPIInstrument, BaseLaserSource, BasePowerMeter):
     - laser_slot (int): Slot number for the tunable laser module.
     - power_slot (int): Slot number for the power meter module.
     - power_channel (int): Channel number (typically 1 or 2) for power measurement.
+    - timeout (int): VISA I/O timeout in milliseconds.
+    - chunk_size (int): VISA read chunk size in bytes.
+    - suppress_print (bool): Silence the command echo of the generic write/query helpers.
 
     Note:
     - Wavelength is set in nanometers.
@@ -38,47 +45,61 @@ class Agilent8163Multimeter(SCPIInstrument, BaseLaserSource, BasePowerMeter):
         laser_slot=1,
         power_slot=2,
         power_channel=1,
-        resource_manager=None
+        resource_manager=None,
+        timeout=10000,
+        chunk_size=102400,
+        suppress_print=True
     ):
+        SCPIInstrument.__init__(self, suppress_print=suppress_print)
         self.address = address
         self.laser_slot = laser_slot
         self.power_slot = power_slot
         self.power_channel = power_channel
+        # Slot and channel are fixed for the session, so bake them into the command strings once
+        self._set_wl_fmt = f"sour{laser_slot}:wav {{:.4f}}NM".format
+        self._read_pow_cmd = f"read{power_slot}:chan{power_channel}:pow?"
+        self._laser_on_cmd = f"sour{laser_slot}:pow:stat 1"
+        self._laser_off_cmd = f"sour{laser_slot}:pow:stat 0"
+        self._query_power = None
         self.connected = False
         self.main = None
 
-        self.rm = resource_manager or visa.ResourceManager()
-        self._owns_rm = resource_manager is None
+        self.rm = resource_manager or default_rm()  # Not closed by the driver: owned by the caller or closed at exit
         try:
             self.main = self.rm.open_resource(address)
+            self._configure_session(timeout, chunk_size)
+            self._query_power = self.main.query
             self.id = self.main.query('*IDN?').strip()
-            self.opt = self.main.query('*OPT?').strip()
             self.connected = True
             logger.info(f"Connected to {self.id} at {self.address}")
-            logger.info(f"Options: {self.opt}")
         except visa.VisaIOError as e:
             logger.error(f"Error connecting to instrument at {address}: {e}")
             raise
 
+    @functools.cached_property
+    def opt(self) -> str:
+        """Installed options (*OPT?), queried on first access."""
+        opt = self.main.query('*OPT?').strip()
+        logger.debug(f"Options: {opt}")
+        return opt
+
     def initialize(self):
         if not self.connected:
             raise RuntimeError("Cannot initialize: Instrument not connected.")
         self.main.write("*CLS")
-        self.main.write(f"sour{self.laser_slot}:pow:stat 1")
+        self.main.write(self._laser_on_cmd)
         logger.info("Laser module initialized.")
 
     def set_wavelength(self, wavelength: float):
         if not self.connected:
             raise RuntimeError("Cannot set wavelength: Instrument not connected.")
-        self.main.write(f'sour{self.laser_slot}:wav {wavelength}NM')
+        self.main.write(self._set_wl_fmt(wavelength))
         logger.debug(f"Wavelength set to {wavelength} nm.")
 
     def measure_power(self) -> float:
         if not self.connected:
             raise RuntimeError("Cannot measure power: Instrument not connected.")
-        response = self.main.query(
-            f'read{self.power_slot}:chan{self.power_channel}:pow?'
-        )
+        response = self.main.query(self._read_pow_cmd)
         try:
             power = float(response)
             logger.debug(f"Measured power: {power} W")
@@ -87,6 +108,109 @@ class Agilent8163Multimeter(SCPIInstrument, BaseLaserSource, BasePowerMeter):
             logger.warning(f"Invalid power reading: {response}")
             raise RuntimeError(f"Invalid power reading: {response}")
 
+    def measure_power_fast(self) -> float:
+        """
+        Read power without the connection check and debug logging of `measure_power`.
+
+        The 8163 power meter only answers single readings in ASCII, so this keeps the
+        query but drops the per-call Python overhead. Meant for sweep loops on an
+        instrument that is known to be connected.
+        """
+        return float(self._query_power(self._read_pow_cmd))
+
+    def sweep_wavelength_logged(
+        self,
+        start_wl: float,
+        stop_wl: float,
+        step: float,
+        avg_time: float = 1e-4,
+        speed: float = 0.5,
+        poll_interval: float = 0.1,
+        timeout: float = None
+    ) -> np.ndarray:
+        """
+        Sweep the laser continuously and log the power meter once per wavelength step.
+
+        The laser emits a trigger at every step and the power meter records one averaged
+        sample per trigger into its logging buffer, which is uploaded as a single binary
+        block when the sweep is done.
+
+        Args:
+            start_wl (float): Starting wavelength in nm.
+            stop_wl (float): Ending wavelength in nm.
+            step (float): Wavelength increment in nm.
+            avg_time (float): Power meter averaging time per sample in seconds.
+            speed (float): Sweep speed in nm/s. Must be supported by the laser module.
+            poll_interval (float): Seconds between logging status polls.
+            timeout (float, optional): Seconds to wait for the logging to complete. Default is the
+                sweep duration at `speed` plus 10 s.
+
+        Returns:
+            np.ndarray: Measured power per wavelength step, in the power meter's configured unit.
+                Sample k was taken at `start_wl + k * step`.
+
+        Raises:
+            RuntimeError: If the instrument is not connected, rejects the sweep settings, or the
+                logging does not complete in time (e.g. the sweep aborted or sent too few triggers).
+            ValueError: If the averaging time is longer than one wavelength step.
+        """
+        if not self.connected:
+            raise RuntimeError("Cannot sweep wavelength: Instrument not connected.")
+        if avg_time > step / speed:
+            raise ValueError(
+                f"Averaging time {avg_time} s is longer than one step ({step / speed} s at {speed} nm/s)."
+            )
+
+        src = f"sour{self.laser_slot}"
+        sens = f"sens{self.power_slot}:chan{self.power_channel}"
+
+        self.main.write(f"{src}:wav:swe:mode CONT")
+        self.main.write(f"{src}:wav:swe:star {start_wl}NM")
+        self.main.write(f"{src}:wav:swe:stop {stop_wl}NM")
+        self.main.write(f"{src}:wav:swe:step {step}NM")
+        self.main.write(f"{src}:wav:swe:spe {speed}NM/S")
+        self.main.write(f"{src}:wav:swe:cycl 1")
+        check = self.main.query(f"{src}:wav:swe:chec?").strip()
+        if not check.startswith("0"):
+            raise RuntimeError(f"Laser rejected sweep settings: {check}")
+        # Log exactly as many samples as the laser will send step-finished triggers
+        num_points = int(float(self.main.query(f"{src}:wav:swe:exp?")))
+        if timeout is None:
+            timeout = abs(stop_wl - start_wl) / speed + 10.0
+
+        # Laser step-finished trigger drives one power meter sample per step
+        trigger_config = self.main.query("trig:conf?").strip()
+        self.main.write("trig:conf LOOP")
+        self.main.write(f"trig{self.laser_slot}:outp STF")
+        self.main.write(f"trig{self.power_slot}:chan{self.power_channel}:inp SME")
+        self.main.write(f"{sens}:func:par:logg {num_points},{avg_time}")
+        self.main.write(f"{sens}:func:stat logg,star")
+        try:
+            self.main.write(f"{src}:wav:swe STAR")
+            deadline = time.monotonic() + timeout
+            while "COMPLETE" not in self.main.query(f"{sens}:func:stat?"):
+                if time.monotonic() > deadline:
+                    self.main.write(f"{src}:wav:swe STOP")
+                    raise RuntimeError(
+                        f"Power meter logging of {num_points} samples did not complete within {timeout:.1f} s."
+                    )
+                time.sleep(poll_interval)
+            powers = self.main.query_binary_values(
+                f"{sens}:func:res?", datatype='f', is_big_endian=False, container=np.ndarray
+            )
+        finally:
+            self.main.write(f"{sens}:func:stat logg,stop")
+            self.main.write(f"trig{self.power_slot}:chan{self.power_channel}:inp IGN")
+            self.main.write(f"trig{self.laser_slot}:outp DIS")
+            self.main.write(f"trig:conf {trigger_config}")
+
+        # The logging buffer is always in Watts; follow measure_power when the meter is set to dBm
+        if int(float(self.main.query(f"{sens}:pow:unit?"))) == 0:
+            powers = 10 * np.log10(powers / 1e-3)
+
+        logger.debug(f"Logged {len(powers)} power samples from {start_wl} to {stop_wl} nm.")
+        return powers
+
     def close(self):
         if self.main and self.connected:
             try:
@@ -99,12 +223,6 @@ class Agilent8163Multimeter(SCPIInstrument, BaseLaserSource, BasePowerMeter):
             except visa.VisaIOError as e:
                 logger.warning(f"Failed to close main resource: {e}")
 
-        if self._owns_rm and self.rm:
-            try:
-                self.rm.close()
-            except visa.VisaIOError as e:
-                logger.warning(f"Failed to close resource manager: {e}")
-
         self.connected = False
         logger.info("Connection closed.")
 
@@ -112,7 +230,7 @@ class Agilent8163Multimeter(SCPIInstrument, BaseLaserSource, BasePowerMeter):
     def turn_off(self):
             if not self.connected:
                 raise RuntimeError("Cannot turn off laser: Instrument not connected.")
-            self.main.write(f"sour{self.laser_slot}:pow:stat 0")
+            self.main.write(self._laser_off_cmd)
             logger.info("Laser turned off")
 
 
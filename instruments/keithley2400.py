@@ -7,35 +7,47 @@ voltage sourcing, current readings, and safe instrument shutdown procedures.
 
 Author: Georgios Charalampous
 Created: 2025-06-01
-Dependencies: pyvisa, numpy, time
+Dependencies: pyvisa, numpy
 """
+import functools
 import numpy as np
 import pyvisa as visa
-import time
+from typing import Optional, Union
 
+from instruments._rm import default_rm
 from instruments.scpi_instrument import SCPIInstrument
 from instruments.sourcemeter_base import BaseSourceMeter
 from utils.logger import setup_logger
+from utils.sweep import sweep_points
 
 logger = setup_logger(__name__)
 
 class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
-    def __init__(self, address='GPIB0::24::INSTR', suppress_print=False, debug=False, resource_manager=None):
+    MAX_SWEEP_POINTS = 2500  # Size of the 2400 sample buffer
+    MAX_MESSAGE_LENGTH = 250  # Stay under the 256-byte input buffer, terminator included
+    _SET_VOLTAGE_AND_READ = ":SOUR:VOLT:LEV {:.6e};:READ?".format
+    _SET_CURRENT_AND_READ = ":SOUR:CURR:LEV {:.6e};:READ?".format
+
+    def __init__(self, address='GPIB0::24::INSTR', suppress_print=False, debug=False, resource_manager=None,
+                 binary_transfer=True, timeout=10000, chunk_size=102400):
+        SCPIInstrument.__init__(self, suppress_print=suppress_print)
         self.address = address
+        self.binary_transfer = binary_transfer  # Set False for firmware without REAL,32 support
         self.suppress_print = suppress_print
         self.debug = debug
         self.connected = False
         self.main = None
         self.id = None
-        self.rm = resource_manager or visa.ResourceManager()
-        self._owns_rm = resource_manager is None
+        self.rm = resource_manager or default_rm()  # Not closed by the driver: owned by the caller or closed at exit
         try:
             self.main = self.rm.open_resource(self.address)
+            # REAL,32 readings come as an indefinite #0 block that may contain '\n' bytes,
+            # so binary sessions must end reads on EOI rather than on a termination character
+            self._configure_session(timeout, chunk_size, read_termination=None if binary_transfer else '\n')
             self.id = self.main.query('*IDN?').strip()
-            self.opt = self.main.query('*OPT?').strip()
             self.connected = True
             logger.info(f"Connected to {self.id} at {self.address}")
-            logger.info(f"Options: {self.opt}")
+            self._set_data_format()
         except visa.VisaIOError as e:
             logger.error(f"Error connecting to Keithley2400 at {address}: {e}")
             raise            
@@ -43,24 +55,111 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
             self.debug_err()
             
                         
-    def initialize(self, wire_mode: int = 2):
+    @functools.cached_property
+    def opt(self) -> str:
+        """Installed options (*OPT?), queried on first access."""
+        opt = self.main.query('*OPT?').strip()
+        logger.debug(f"Options: {opt}")
+        return opt
+
+
+    def initialize(self, wire_mode: int = 2, source_delay: float = None, fast_mode: bool = False):
+        """
+        Resets the Keithley 2400 and prepares it for measurements.
+
+        Parameters:
+            wire_mode (int, optional): 2 for 2-wire or 4 for 4-wire sensing. Default is 2.
+            source_delay (float, optional): Source delay in seconds applied before each reading. Default keeps the instrument setting.
+            fast_mode (bool, optional): Disable the front-panel display, auto-zero and concurrent functions
+                to shorten each measurement cycle. Without auto-zero the reference and zero are not
+                re-measured, so readings drift with temperature over long runs. Default is False.
+
+        Raises:
+            RuntimeError: If the instrument is not connected.
+            ValueError: If the wire mode is not 2 or 4.
+        """
         if not self.connected:
             raise RuntimeError("Cannot initialize: Instrument not connected.")
-        # self.main.write("*SRE 0")  # Query ID to ensure communication
-        self.main.write("*CLS")
-        self.main.write("*RST")  # Reset the device
-        self.main.write(":OUTP OFF")
-        if wire_mode == 2:
-            self.main.write(":SYST:RSEN OFF")  # Disable remote sensing
-        elif wire_mode == 4:
-            self.main.write(":SYST:RSEN ON")
-        else:
+        if wire_mode not in (2, 4):
             raise ValueError("Invalid wire mode. Use 2 for 2-wire or 4 for 4-wire mode.")
+        # self.main.write("*SRE 0")  # Query ID to ensure communication
+        commands = [
+            "*CLS",
+            "*RST",  # Reset the device
+            ":OUTP OFF",
+            f":SYST:RSEN {'ON' if wire_mode == 4 else 'OFF'}",  # Remote sensing only in 4-wire mode
+        ]
+        if source_delay is not None:
+            commands.append(f":SOUR:DEL {source_delay}")  # Settle on the instrument before each reading
+        if fast_mode:
+            # Skip the display refresh, auto-zero and concurrent functions after every reading
+            commands += [":DISP:ENAB OFF", ":SYST:AZER:STAT OFF", ":SENS:FUNC:CONC OFF"]
+        self._write_compound(*commands)
+        self._set_data_format()  # *RST restores ASCII transfers
         logger.info("Source meter is initialized.")
+
+
+    def _write_compound(self, *commands: Optional[str]):
+        """Send commands as ';'-joined compound messages, splitting them to fit the input buffer. None entries are skipped."""
+        message = ""
+        for command in commands:
+            if command is None:
+                continue
+            if message and len(message) + 1 + len(command) > self.MAX_MESSAGE_LENGTH:
+                self.main.write(message)
+                message = command
+            else:
+                message = f"{message};{command}" if message else command
+        if message:
+            self.main.write(message)
+
+
+    def _set_data_format(self):
+        """Select little-endian REAL,32 or ASCII reading transfers and bind the matching parser."""
+        if self.binary_transfer:
+            self._write_compound(":FORM:DATA REAL,32", ":FORM:BORD SWAP")
+            self._read_response = self._read_binary
+        else:
+            self.main.write(":FORM:DATA ASCII")
+            self._read_response = self._read_ascii
+
+
+    def _read_binary(self, data_points: int = 1) -> np.ndarray:
+        """
+        Read a REAL,32 response of `data_points` values.
+
+        The 2400 sends an indefinite #0 block that carries no length, so the number of
+        values must be given: one per :FORM:ELEM field and trigger.
+        """
+        return self.main.read_binary_values(
+            datatype='f', is_big_endian=False, container=np.ndarray, data_points=data_points
+        )
+
+
+    def _read_ascii(self, data_points: int = 1) -> np.ndarray:
+        """Read a comma-separated ASCII response; the values are counted by the separators."""
+        return self.main.read_ascii_values(converter='f', separator=',', container=np.ndarray)
+
+
+    @staticmethod
+    def _scalar_if_single(values: np.ndarray) -> Union[float, np.ndarray]:
+        """Unwrap a single reading to a float; keep multi-reading responses as an array."""
+        return float(values[0]) if len(values) == 1 else values
+
+
+    def _read_values(self, command: str = ":READ?", out: Optional[np.ndarray] = None,
+                     data_points: int = 1) -> np.ndarray:
+        """Trigger a reading and return the response as a float array, written into `out` if given."""
+        self.main.write(command)
+        values = self._read_response(data_points)
+        if out is None:
+            return values
+        out[:len(values)] = values
+        return out
           
             
-    def read_resistance_auto(self, resistance_range: float = 20E3) -> np.ndarray:
-        """Measure resistance in ohms using a single-point measurement."""
+    def read_resistance_auto(self, resistance_range: float = 20E3, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Measure resistance in ohms using a single-point measurement, optionally into a preallocated `out`."""
         if not self.connected:
             raise RuntimeError("Instrument not connected.")
         self.main.write(":SOUR:FUNC VOLT")  # Source voltage
@@ -70,14 +169,12 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         self.main.write(f":SENS:RES:RANG {resistance_range}")  # Set resistance range
         self.main.write(":FORM:ELEM RES")  # Only return resistance
         self.main.write(":OUTP ON")  # Enable output
-        resistance = self.main.query(":READ?")
-        self.main.write(":OUTP OFF")  # Disable output after reading
         try:
-            # Usually one value, but safely split in case of unexpected formatting
-            resistance_values = [float(val) for val in resistance.strip().split(',') if val]
-            return np.array(resistance_values)
-        except ValueError:
-            raise ValueError(f"Could not parse resistance value from: {resistance}")
+            return self._read_values(out=out)
+        except ValueError as e:
+            raise ValueError(f"Could not parse resistance value: {e}") from e
+        finally:
+            self.main.write(":OUTP OFF")  # Disable output after reading
     
     
     def read_resistance_configured(self,
@@ -89,12 +186,13 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
                                 source_func: str = "VOLT",
                                 source_level: float = 0.05,
                                 wire_mode: int = 2,
-                                delay: float = 0.1) -> np.ndarray:
+                                delay: float = 0.1,
+                                out: Optional[np.ndarray] = None) -> np.ndarray:
         if not self.connected:
             raise RuntimeError("Instrument not connected.")
         
         if mode == "AUTO":
-            res_auto = self.read_resistance_auto(resistance_range)
+            res_auto = self.read_resistance_auto(resistance_range, out=out)
             return res_auto
         
         
@@ -114,17 +212,15 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
             self.main.write(f":SOUR:CURR:RANGE {source_level}")  
             self.main.write(f":SOUR:CURR {source_level}")
             
+        self.main.write(f":SOUR:DEL {delay}")
         self.main.write(":FORM:ELEM RES")
         self.main.write(":OUTP ON")
-        time.sleep(delay)
-        resistance = self.main.query(":READ?")
-        self.main.write(":OUTP OFF")
-
         try:
-            return np.array([float(resistance.strip())])
-        except ValueError:
-            logger.warning(f"Could not parse response: {resistance}")
-            return np.array([np.nan])
+            return self._read_values(out=out)
+        except ValueError as e:
+            raise ValueError(f"Could not parse resistance value: {e}") from e
+        finally:
+            self.main.write(":OUTP OFF")
 
            
     def source_voltage_and_read_current(
@@ -133,8 +229,9 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         source_voltage_range: float,
         measure_current_range: float = 1E-3,
         current_limit: float = 0.01,
-        delay: float = 0.1
-    ) -> np.ndarray:
+        delay: Optional[float] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Union[float, np.ndarray]:
         """
         Sources a specified DC voltage using the Keithley 2400 and measures the resulting current.
 
@@ -143,9 +240,13 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
             source_voltage_range (float): The voltage range to use for sourcing in volts (V).
             measure_current_range (float, optional): The measurement range for current in amperes (A). Default is 1E-3 A.
             current_limit (float, optional): The compliance (protection) current limit in amperes (A). Default is 0.01 A.
+            delay (float, optional): Source delay in seconds applied by the instrument before the measurement.
+                Default None keeps the delay set with `initialize(source_delay=...)` or the instrument's own.
+            out (np.ndarray, optional): Preallocated buffer, e.g. a slice of a sweep result array, to write the readings into.
 
         Returns:
-            np.ndarray: Array of measured current values in amperes (A).
+            float | np.ndarray: Measured current in amperes (A); an array only if the instrument returns several readings.
+                If `out` is given, the readings are written into it and `out` is returned.
 
         Raises:
             RuntimeError: If the instrument is not connected.
@@ -153,20 +254,20 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         if not self.connected:
             raise RuntimeError("Instrument not connected.")
 
-        self.main.write(":SOUR:FUNC VOLT")
-        self.main.write(":SOUR:VOLT:MODE FIXED")
-        self.main.write(f":SOUR:VOLT:RANG {source_voltage_range}")
-        self.main.write(f":SOUR:VOLT:LEV {source_voltage_level}")
-        self.main.write(f":SENS:CURR:PROT {current_limit}")
-        self.main.write(":SENS:FUNC 'CURR'")
-        self.main.write(f":SENS:CURR:RANG {measure_current_range}")
-        self.main.write(":FORM:ELEM CURR")
-        self.main.write(":OUTP ON")
-        time.sleep(delay)
-        current_response = self.main.query(":READ?")
+        self._write_compound(
+            ":SOUR:FUNC VOLT",
+            ":SOUR:VOLT:MODE FIXED",
+            f":SOUR:VOLT:RANG {source_voltage_range}",
+            f":SENS:CURR:PROT {current_limit}",
+            ":SENS:FUNC 'CURR'",
+            f":SENS:CURR:RANG {measure_current_range}",
+            f":SOUR:DEL {delay}" if delay is not None else None,
+            ":FORM:ELEM CURR",
+            ":OUTP ON",
+        )
         # self.main.write(":OUTP OFF")
-        current_values = [float(val) for val in current_response.strip().split(',') if val]
-        return np.array(current_values)
+        values = self._read_values(f":SOUR:VOLT:LEV {source_voltage_level};:READ?", out)
+        return values if out is not None else self._scalar_if_single(values)
      
      
      
@@ -178,8 +279,9 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         source_current_range: float,
         measure_voltage_range: float = 1.0,
         voltage_limit: float = 1.0,
-        delay: float = 0.1
-    ) -> np.ndarray:
+        delay: Optional[float] = None,
+        out: Optional[np.ndarray] = None
+    ) -> Union[float, np.ndarray]:
         """
         Sources a specified DC current using the Keithley 2400 and measures the resulting voltage.
 
@@ -188,10 +290,13 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
             source_current_range (float): The current range to use for sourcing in amperes (A).
             measure_voltage_range (float, optional): The measurement range for voltage in volts (V). Default is 1.0 V.
             voltage_limit (float, optional): The compliance (protection) voltage limit in volts (V). Default is 1 V.
-            delay (float, optional): Delay in seconds before reading the measurement. Default is 0.1 s.
+            delay (float, optional): Source delay in seconds applied by the instrument before the measurement.
+                Default None keeps the delay set with `initialize(source_delay=...)` or the instrument's own.
+            out (np.ndarray, optional): Preallocated buffer, e.g. a slice of a sweep result array, to write the readings into.
 
         Returns:
-            np.ndarray: Array of measured voltage values in volts (V).
+            float | np.ndarray: Measured voltage in volts (V); an array only if the instrument returns several readings.
+                If `out` is given, the readings are written into it and `out` is returned.
 
         Raises:
             RuntimeError: If the instrument is not connected.
@@ -199,20 +304,218 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         if not self.connected:
             raise RuntimeError("Instrument not connected.")
 
-        self.main.write(":SOUR:FUNC CURR")
-        self.main.write(":SOUR:CURR:MODE FIXED")
-        self.main.write(":SENS:FUNC 'VOLT'")
-        self.main.write(f":SOUR:CURR:RANG {source_current_range}")
-        self.main.write(f":SOUR:CURR:LEV {source_current_level}")
-        self.main.write(f":SENS:VOLT:PROT {voltage_limit}")
-        self.main.write(f":SENS:VOLT:RANG {measure_voltage_range}")
-        self.main.write(":FORM:ELEM VOLT")
-        self.main.write(":OUTP ON")
-        time.sleep(delay)
-        current_response = self.main.query(":READ?")
+        self._write_compound(
+            ":SOUR:FUNC CURR",
+            ":SOUR:CURR:MODE FIXED",
+            ":SENS:FUNC 'VOLT'",
+            f":SOUR:CURR:RANG {source_current_range}",
+            f":SENS:VOLT:PROT {voltage_limit}",
+            f":SENS:VOLT:RANG {measure_voltage_range}",
+            f":SOUR:DEL {delay}" if delay is not None else None,
+            ":FORM:ELEM VOLT",
+            ":OUTP ON",
+        )
         # self.main.write(":OUTP OFF")
-        current_values = [float(val) for val in current_response.strip().split(',') if val]
-        return np.array(current_values) 
+        values = self._read_values(f":SOUR:CURR:LEV {source_current_level};:READ?", out)
+        return values if out is not None else self._scalar_if_single(values)
+
+
+
+    def configure_voltage_source(
+        self,
+        source_range: float,
+        compliance: float = 0.01,
+        measure_range: float = 1E-3,
+        nplc: float = 1.0,
+        wire_mode: int = 2,
+        delay: Optional[float] = None
+    ) -> "Keithley2400SourceMeter":
+        """
+        Configures the Keithley 2400 to source voltage and measure current, and enables the output.
+
+        Call once before a sweep, then use `set_voltage_and_read` for every point.
+
+        Parameters:
+            source_range (float): The voltage range to use for sourcing in volts (V).
+            compliance (float, optional): The compliance (protection) current limit in amperes (A). Default is 0.01 A.
+            measure_range (float, optional): The measurement range for current in amperes (A). Default is 1E-3 A.
+            nplc (float, optional): Integration time in power line cycles. Default is 1.0.
+            wire_mode (int, optional): 2 for 2-wire or 4 for 4-wire sensing. Default is 2.
+            delay (float, optional): Source delay in seconds before each measurement.
+                Default None keeps the delay set with `initialize(source_delay=...)` or the instrument's own.
+
+        Returns:
+            Keithley2400SourceMeter: The configured instrument.
+
+        Raises:
+            RuntimeError: If the instrument is not connected.
+        """
+        if not self.connected:
+            raise RuntimeError("Instrument not connected.")
+
+        self._write_compound(
+            ":SOUR:FUNC VOLT",
+            ":SOUR:VOLT:MODE FIXED",
+            f":SOUR:VOLT:RANG {source_range}",
+            f":SENS:CURR:PROT {compliance}",
+            ":SENS:FUNC 'CURR'",
+            f":SENS:CURR:RANG {measure_range}",
+            f":SENS:CURR:NPLC {nplc}",
+            f":SYST:RSEN {'ON' if wire_mode == 4 else 'OFF'}",
+            f":SOUR:DEL {delay}" if delay is not None else None,
+            ":FORM:ELEM CURR",
+            ":OUTP ON",
+        )
+        self._bind_fast_io()
+        return self
+
+
+    def configure_current_source(
+        self,
+        source_range: float,
+        compliance: float = 1.0,
+        measure_range: float = 1.0,
+        nplc: float = 1.0,
+        wire_mode: int = 2,
+        delay: Optional[float] = None
+    ) -> "Keithley2400SourceMeter":
+        """
+        Configures the Keithley 2400 to source current and measure voltage, and enables the output.
+
+        Call once before a sweep, then use `set_current_and_read` for every point.
+
+        Parameters:
+            source_range (float): The current range to use for sourcing in amperes (A).
+            compliance (float, optional): The compliance (protection) voltage limit in volts (V). Default is 1 V.
+            measure_range (float, optional): The measurement range for voltage in volts (V). Default is 1.0 V.
+            nplc (float, optional): Integration time in power line cycles. Default is 1.0.
+            wire_mode (int, optional): 2 for 2-wire or 4 for 4-wire sensing. Default is 2.
+            delay (float, optional): Source delay in seconds before each measurement.
+                Default None keeps the delay set with `initialize(source_delay=...)` or the instrument's own.
+
+        Returns:
+            Keithley2400SourceMeter: The configured instrument.
+
+        Raises:
+            RuntimeError: If the instrument is not connected.
+        """
+        if not self.connected:
+            raise RuntimeError("Instrument not connected.")
+
+        self._write_compound(
+            ":SOUR:FUNC CURR",
+            ":SOUR:CURR:MODE FIXED",
+            ":SENS:FUNC 'VOLT'",
+            f":SOUR:CURR:RANG {source_range}",
+            f":SENS:VOLT:PROT {compliance}",
+            f":SENS:VOLT:RANG {measure_range}",
+            f":SENS:VOLT:NPLC {nplc}",
+            f":SYST:RSEN {'ON' if wire_mode == 4 else 'OFF'}",
+            f":SOUR:DEL {delay}" if delay is not None else None,
+            ":FORM:ELEM VOLT",
+            ":OUTP ON",
+        )
+        self._bind_fast_io()
+        return self
+
+
+    def _bind_fast_io(self):
+        """Cache the session's write and response parser so the per-point methods skip attribute lookups."""
+        self._fast_write = self.main.write
+        self._fast_read = self._read_response
+
+
+    def set_voltage_and_read(self, voltage: float) -> float:
+        """Set the voltage level of a configured source and read the current in one compound command."""
+        self._fast_write(self._SET_VOLTAGE_AND_READ(voltage))
+        return float(self._fast_read()[0])
+
+
+    def set_current_and_read(self, current: float) -> float:
+        """Set the current level of a configured source and read the voltage in one compound command."""
+        self._fast_write(self._SET_CURRENT_AND_READ(current))
+        return float(self._fast_read()[0])
+
+
+    def sweep_voltage_linear(
+        self,
+        start: float,
+        stop: float,
+        step: float,
+        compliance: float = 0.01,
+        measure_range: float = 1E-3,
+        nplc: float = 1.0,
+        delay: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Runs a linear staircase voltage sweep on the Keithley 2400 and reads back all currents at once.
+
+        The sweep is executed by the instrument's trigger model, so only the setup, the
+        completion poll and a single binary fetch go over the bus.
+
+        Parameters:
+            start (float): Start voltage in volts (V).
+            stop (float): Stop voltage in volts (V).
+            step (float): Voltage increment in volts (V). The sign is taken from start/stop.
+            compliance (float, optional): The compliance (protection) current limit in amperes (A). Default is 0.01 A.
+            measure_range (float, optional): The measurement range for current in amperes (A). Default is 1E-3 A.
+            nplc (float, optional): Integration time in power line cycles. Default is 1.0.
+            delay (float, optional): Source delay in seconds before each measurement.
+                Default None keeps the delay set with `initialize(source_delay=...)` or the instrument's own.
+
+        Returns:
+            np.ndarray: Array of measured current values in amperes (A), one per sweep point.
+
+        Raises:
+            RuntimeError: If the instrument is not connected.
+            ValueError: If the span is not a whole number of steps or the sweep exceeds
+                the 2500-point buffer of the instrument.
+        """
+        if not self.connected:
+            raise RuntimeError("Instrument not connected.")
+
+        num_points = sweep_points(start, stop, step)
+        step = np.copysign(abs(step), stop - start)
+        if num_points > self.MAX_SWEEP_POINTS:
+            raise ValueError(
+                f"Sweep of {num_points} points exceeds the {self.MAX_SWEEP_POINTS}-point instrument buffer."
+            )
+
+        self.main.write(":SENS:FUNC:CONC OFF")
+        self.main.write(":SOUR:FUNC VOLT")
+        self.main.write(":SENS:FUNC 'CURR:DC'")
+        self.main.write(f":SENS:CURR:PROT {compliance}")
+        self.main.write(f":SENS:CURR:RANG {measure_range}")
+        self.main.write(f":SENS:CURR:NPLC {nplc}")
+        self.main.write(f":SOUR:VOLT:STAR {start}")
+        self.main.write(f":SOUR:VOLT:STOP {stop}")
+        self.main.write(f":SOUR:VOLT:STEP {step}")
+        self.main.write(":SOUR:VOLT:MODE SWE")
+        self.main.write(":SOUR:SWE:RANG BEST")
+        self.main.write(":SOUR:SWE:SPAC LIN")
+        if delay is not None:
+            self.main.write(f":SOUR:DEL {delay}")
+        self.main.write(f":TRIG:COUN {num_points}")
+        self.main.write(":FORM:ELEM CURR")
+
+        # *OPC? blocks until the whole sweep is done, so widen the timeout to cover it
+        timeout = self.main.timeout
+        if delay is None:
+            delay = float(self.main.query(":SOUR:DEL?"))  # Budget for the delay the instrument keeps
+        sweep_time = num_points * (delay + nplc / 50 + 0.01)
+        self.main.timeout = max(timeout, 2 * sweep_time * 1000 + 5000)
+        try:
+            self.main.write(":OUTP ON")
+            self.main.write(":INIT")
+            self.main.query("*OPC?")
+            currents = self._read_values(":FETC?", data_points=num_points)
+        finally:
+            self.main.timeout = timeout
+            self.main.write(":OUTP OFF")
+            self.main.write(":TRIG:COUN 1")
+            self.main.write(":SOUR:VOLT:MODE FIXED")
+
+        return currents
      
      
      
@@ -227,6 +530,7 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
         
         try:
             self.main.write(":OUTP OFF")  # Disable output
+            self.main.write(":DISP:ENAB ON")  # Restore the display if fast mode turned it off
             logger.info("Source meter turned off.")
         except visa.VisaIOError as e:
             logger.warning(f"Warning: Failed to turn off source meter: {e}")        
@@ -244,12 +548,6 @@ class Keithley2400SourceMeter(SCPIInstrument, BaseSourceMeter):
             except visa.VisaIOError as e:
                 logger.warning(f"Failed to close main resource: {e}")
 
-        if self._owns_rm and self.rm:
-            try:
-                self.rm.close()
-            except visa.VisaIOError as e:
-                logger.warning(f"Failed to close resource manager: {e}")
-
         self.connected = False
         logger.info("Connection closed.")
 
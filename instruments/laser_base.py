@@ -13,6 +13,11 @@ class BaseLaserSource(ABC):
         """Set the laser output wavelength in nanometers."""
         pass
     
+    def sweep_wavelength_logged(self, start_wl: float, stop_wl: float, step: float, avg_time: float = 1e-4,
+                                speed: float = 0.5):
+        """Run a hardware-timed wavelength sweep and return the logged optical power per step."""
+        raise NotImplementedError(f"{type(self).__name__} does not support logged wavelength sweeps.")
+
     @abstractmethod
     def turn_off(self):
         """Ensure the laser is safely turned off."""
@@ -13,6 +13,10 @@ class BasePowerMeter(ABC):
         """Measure and return optical power in dBm or nW."""
         pass
 
+    def measure_power_fast(self) -> float:
+        """Measure optical power with minimal per-call overhead, for use inside sweep loops."""
+        return self.measure_power()
+
     @abstractmethod
     def close(self):
         """Close the connection and clean up resources."""
@@ -1,23 +1,133 @@
 # scpi_instrument.py
+import logging
+from functools import lru_cache
+from typing import Callable, List
+
+import numpy as np
+
+from utils.logger import setup_logger
+
+# Command echo goes through logging so disabled records cost a level check, not a format
+logger = setup_logger(__name__, logging.DEBUG)
+
+
+def _no_log(*args):
+    pass
+
+
 class SCPIInstrument:
     def __init__(self, suppress_print=False):
         self.suppress_print = suppress_print
         self.connected = False
         self.main = None
+        self._log = _no_log if suppress_print else logger.debug
+        # Only for queries whose answer never changes during a session, e.g. *IDN?
+        self._cached_query = lru_cache(maxsize=128)(self._raw_query)
+        self._strip_response = True  # Until a read termination strips responses for us
+
+    def _configure_session(self, timeout: int = 10000, chunk_size: int = 102400, read_termination: str = '\n'):
+        """
+        Tune the opened VISA session for fast message exchange.
+
+        The chunk size covers a full 2500-reading buffer from a Keithley 2400 in one read,
+        so block transfers are not split into many small reads.
+        """
+        self.main.timeout = timeout
+        self.main.chunk_size = chunk_size
+        self.main.write_termination = '\n'
+        self.main.read_termination = read_termination
+        self.main.send_end = True
+        self.main.query_delay = 0.0
+        # With a read termination set, pyvisa already removes it from every response
+        self._strip_response = read_termination is None
 
     def write(self, command: str):
         if not self.connected or self.main is None:
             raise RuntimeError("Instrument not connected.")
-        if not self.suppress_print:
-            print(f">>> {command}")
+        self._log(">>> %s", command)
         self.main.write(command)
 
     def query(self, command: str) -> str:
         if not self.connected or self.main is None:
             raise RuntimeError("Instrument not connected.")
-        if not self.suppress_print:
-            print(f">>> {command}")
+        return self._raw_query(command)
+
+    def _raw_query(self, command: str) -> str:
+        self._log(">>> %s", command)
         response = self.main.query(command)
-        if not self.suppress_print:
-            print(f"<<< {response.strip()}")
-        return response.strip()
+        if self._strip_response:
+            response = response.strip()
+        self._log("<<< %s", response)
+        return response
+
+    def query_binary_values(self, command: str, datatype: str = 'f', is_big_endian: bool = True,
+                            container=np.ndarray):
+        """
+        Query an IEEE-488.2 binary block and decode it without going through a string.
+
+        IEEE-488.2 instruments send big-endian data unless a swapped byte order was
+        selected (e.g. `FORM:BORD SWAP`); pass `is_big_endian=False` in that case.
+        """
+        if not self.connected or self.main is None:
+            raise RuntimeError("Instrument not connected.")
+        self._log(">>> %s", command)
+        return self.main.query_binary_values(command, datatype=datatype, is_big_endian=is_big_endian,
+                                             container=container)
+
+    def query_ascii_array(self, command: str, separator: str = ',') -> np.ndarray:
+        """Query a separated list of numbers, e.g. "1.23e-3,4.56e-3", and parse it straight into a float array."""
+        if not self.connected or self.main is None:
+            raise RuntimeError("Instrument not connected.")
+        self._log(">>> %s", command)
+        return self.main.query_ascii_values(command, converter='f', separator=separator, container=np.ndarray)
+
+    def query_binary_array(self, command: str, datatype: str = 'f', is_big_endian: bool = True) -> np.ndarray:
+        """
+        Query an IEEE-488.2 binary block of numbers as a float64 array.
+
+        Unlike `query_binary_values`, which keeps the wire type (e.g. float32 or int16),
+        the result is always float64, ready for arithmetic alongside other readings.
+        """
+        values = self.query_binary_values(command, datatype=datatype, is_big_endian=is_big_endian)
+        return values.astype(np.float64, copy=False)
+
+    def prepare(self, template: str) -> Callable[..., None]:
+        """
+        Return a fast writer for a fixed command template, e.g. `set_v = inst.prepare(":SOUR:VOLT %g")`.
+
+        `{}` placeholders are accepted as `%s`. The session's write method is bound
+        once, so calls in a sweep loop only format the arguments and send.
+        """
+        if not self.connected or self.main is None:
+            raise RuntimeError("Instrument not connected.")
+        fmt = template.replace("{}", "%s")
+        write = self.main.write
+        log = self._log
+
+        if log is _no_log:
+            def _call(*args):
+                write(fmt % args)
+        else:
+            def _call(*args):
+                command = fmt % args
+                log(">>> %s", command)
+                write(command)
+        return _call
+
+    def write_many(self, commands: List[str]):
+        """Send several commands as one ';'-joined compound message."""
+        self.write(";".join(commands))
+
+    def query_many(self, commands: List[str]) -> List[str]:
+        """Send several queries as one compound message and split the ';'-separated answers."""
+        return self.query(";".join(commands)).split(";")
+
+    def query_cached(self, command: str) -> str:
+        """Query once and reuse the answer. Only use for responses that cannot change, like *IDN?."""
+        if not self.connected or self.main is None:
+            raise RuntimeError("Instrument not connected.")
+        return self._cached_query(command)
+
+    def invalidate_cache(self):
+        """Forget all cached query answers, e.g. after a reset or reconfiguration."""
+        self._cached_query.cache_clear()
@@ -3,22 +3,29 @@ Abstract base class for generic source meter instruments.
 
 Defines the required interface for resistance measurement, voltage sourcing,
 current reading, and resource management.
+
+Multi-point reads (buffers, sweeps) should fetch all readings with a single
+`query_ascii_array` or `query_binary_array` call on the SCPI session rather
+than N single-point `query` calls parsed with `float()`.
 """
 
 import numpy as np
 from abc import ABC, abstractmethod
+from typing import Optional, Union
 class BaseSourceMeter(ABC):
     """Abstract base class for source meter instruments."""
 
+    MAX_SWEEP_POINTS = 0  # Longest sweep_voltage_linear run; 0 without hardware sweep support
+
     @abstractmethod
-    def initialize(self, wire_mode: int = 2):
+    def initialize(self, wire_mode: int = 2, source_delay: float = None, fast_mode: bool = False):
         """Prepare the source meter for operation."""
         pass
 
 
     @abstractmethod
-    def read_resistance_auto(self, resistance_range: float = 20e3) -> np.ndarray:
-        """Measure resistance in ohms and return as a numpy array."""
+    def read_resistance_auto(self, resistance_range: float = 20e3, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Measure resistance in ohms and return as a numpy array, written into `out` if given."""
         pass
     
     @abstractmethod
@@ -30,8 +37,9 @@ class BaseSourceMeter(ABC):
                                 current_prot: float = 0.01,
                                 source_func: str = "VOLT",
                                 source_level: float = 0.05,
-                                wire_mode: int = 2) -> np.ndarray:
-        """Measure resistance in ohms with specific configurations and return as a numpy array."""
+                                wire_mode: int = 2,
+                                out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Measure resistance in ohms with specific configurations and return as a numpy array, written into `out` if given."""
         pass
 
     @abstractmethod
@@ -40,8 +48,9 @@ class BaseSourceMeter(ABC):
         source_voltage_range: float,
         measure_current_range: float = 1E-3,
         current_limit: float = 0.01,
-        delay: float = 0.1) -> np.ndarray:
-        """Source a voltage and read the resulting current, returning as a numpy array."""
+        delay: Optional[float] = None,
+        out: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        """Source a voltage and read the resulting current, as a float for a single reading or into `out` if given."""
         pass
 
     @abstractmethod
@@ -50,10 +59,58 @@ class BaseSourceMeter(ABC):
         source_current_range: float,
         measure_voltage_range: float = 1E-3,
         voltage_limit: float = 1,
-        delay: float = 0.1) -> np.ndarray:
-        """Source a current and read the resulting voltage, returning as a numpy array."""
+        delay: Optional[float] = None,
+        out: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        """Source a current and read the resulting voltage, as a float for a single reading or into `out` if given."""
+        pass
+
+    @abstractmethod
+    def configure_voltage_source(self,
+        source_range: float,
+        compliance: float = 0.01,
+        measure_range: float = 1E-3,
+        nplc: float = 1.0,
+        wire_mode: int = 2,
+        delay: Optional[float] = None) -> "BaseSourceMeter":
+        """Configure voltage sourcing with current measurement once, ahead of a sweep."""
+        pass
+
+    @abstractmethod
+    def configure_current_source(self,
+        source_range: float,
+        compliance: float = 1.0,
+        measure_range: float = 1.0,
+        nplc: float = 1.0,
+        wire_mode: int = 2,
+        delay: Optional[float] = None) -> "BaseSourceMeter":
+        """Configure current sourcing with voltage measurement once, ahead of a sweep."""
         pass
 
+    @abstractmethod
+    def set_voltage_and_read(self, voltage: float) -> float:
+        """Set the source voltage of a configured sweep and return the measured current."""
+        pass
+
+    @abstractmethod
+    def set_current_and_read(self, current: float) -> float:
+        """Set the source current of a configured sweep and return the measured voltage."""
+        pass
+
+    def sweep_voltage_linear(self,
+        start: float,
+        stop: float,
+        step: float,
+        compliance: float = 0.01,
+        measure_range: float = 1E-3,
+        nplc: float = 1.0,
+        delay: Optional[float] = None) -> np.ndarray:
+        """
+        Run a hardware-timed linear voltage sweep and return the measured currents as a numpy array.
+
+        Drivers that implement this set MAX_SWEEP_POINTS to the longest sweep they can run.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support hardware sweeps.")
+
 
     @abstractmethod
     def turn_off(self):
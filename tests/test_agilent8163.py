@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from controllers.laser_sweep import perform_laser_sweep
+from instruments.agilent8163 import Agilent8163Multimeter
+
+
+class FakeSession:
+    """Answers the 8163 logging queries; `logging_done` controls the function status."""
+
+    def __init__(self, expected_points=5, unit="+0", logging_done=True):
+        self.written = []
+        self.expected_points = expected_points
+        self.unit = unit
+        self.logging_done = logging_done
+
+    def write(self, command):
+        self.written.append(command)
+
+    def query(self, command):
+        self.written.append(command)
+        if command == "*IDN?":
+            return "Agilent Technologies,8163B,0,V5.25"
+        if command.endswith(":wav:swe:chec?"):
+            return "0,OK"
+        if command.endswith(":wav:swe:exp?"):
+            return f"+{self.expected_points}"
+        if command == "trig:conf?":
+            return "DEF"
+        if command.endswith(":func:stat?"):
+            return "LOGGING_STABILITY,COMPLETE" if self.logging_done else "LOGGING_STABILITY,PROGRESS"
+        if command.endswith(":pow:unit?"):
+            return self.unit
+        raise AssertionError(f"unexpected query {command}")
+
+    def query_binary_values(self, command, **kwargs):
+        return np.full(self.expected_points, 1e-3)
+
+
+class FakeResourceManager:
+    def __init__(self, session):
+        self.session = session
+
+    def open_resource(self, address):
+        return self.session
+
+
+def _meter(session):
+    return Agilent8163Multimeter(resource_manager=FakeResourceManager(session))
+
+
+def test_logged_sweep_uses_laser_point_count_and_restores_trigger_config():
+    session = FakeSession(expected_points=5)
+    powers = _meter(session).sweep_wavelength_logged(1550.0, 1550.4, 0.1, speed=5)
+    assert len(powers) == 5
+    assert "sens2:chan1:func:par:logg 5,0.0001" in session.written
+    assert session.written.index("trig:conf DEF") > session.written.index("trig:conf LOOP")
+
+
+def test_signed_zero_unit_still_converts_to_dbm():
+    powers = _meter(FakeSession(unit="+0")).sweep_wavelength_logged(1550.0, 1550.4, 0.1, speed=5)
+    np.testing.assert_allclose(powers, 0.0)
+
+
+def test_watt_unit_is_left_in_watts():
+    powers = _meter(FakeSession(unit="+1")).sweep_wavelength_logged(1550.0, 1550.4, 0.1, speed=5)
+    np.testing.assert_allclose(powers, 1e-3)
+
+
+def test_incomplete_logging_times_out():
+    session = FakeSession(logging_done=False)
+    with pytest.raises(RuntimeError, match="did not complete"):
+        _meter(session).sweep_wavelength_logged(1550.0, 1550.4, 0.1, speed=5, poll_interval=0.001, timeout=0.01)
+    assert "trig:conf DEF" in session.written
+    assert "sens2:chan1:func:stat logg,stop" in session.written
+
+
+def test_laser_sweep_labels_samples_at_start_plus_k_steps():
+    session = FakeSession(expected_points=5)
+    headers, results = perform_laser_sweep(_meter(session), 1550.0, 1550.4, 0.1, use_hardware_sweep=True, speed=5)
+    np.testing.assert_allclose(results[:, 0], [1550.0, 1550.1, 1550.2, 1550.3, 1550.4])
@@ -0,0 +1,91 @@
+import gzip
+import time
+
+import numpy as np
+import pytest
+
+from utils import data_saver
+from utils.data_saver import AsyncCSVWriter, RawMeasurementWriter, save_raw_measurements
+
+
+def _line_count(path: str) -> int:
+    with open(path) as f:
+        return sum(1 for _ in f)
+
+
+def test_async_writer_rows_reach_disk_before_close(tmp_path):
+    writer = AsyncCSVWriter(("a", "b"), "async", base_dir=str(tmp_path), batch=100)
+    try:
+        for i in range(3000):
+            writer.put((i, 2 * i))
+        deadline = time.monotonic() + 5
+        while _line_count(writer.path) < 3001 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _line_count(writer.path) == 3001
+    finally:
+        writer.close()
+    with open(writer.path) as f:
+        assert f.readline() == "a,b\n"
+        assert f.readline() == "0,0\n"
+
+
+def test_async_writer_rejects_rows_after_close(tmp_path):
+    writer = AsyncCSVWriter(("a", "b"), "closed", base_dir=str(tmp_path), maxsize=1)
+    writer.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.put((1, 2))
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.put((3, 4))  # Would block forever on the full queue without the check
+
+
+def _read(path: str) -> str:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", newline="") as f:
+        return f.read()
+
+
+def test_writer_buffers_rows_and_writes_header_once(tmp_path):
+    with RawMeasurementWriter(("V", "I"), "buffered", flush_rows=2, base_dir=str(tmp_path)) as writer:
+        writer.append((0.0, 1e-3))
+        writer.append_many(np.array([[0.5, 2e-3], [1.0, 3e-3]]))
+    assert _read(writer.path) == "V,I\n0.0,0.001\n0.5,0.002\n1.0,0.003\n"
+
+
+def test_writer_append_mode_skips_header_of_existing_file(tmp_path):
+    for rows in ([(1, 2)], [(3, 4)]):
+        with RawMeasurementWriter(("a", "b"), "appended", append=True, base_dir=str(tmp_path)) as writer:
+            writer.append_many(rows)
+    assert _read(writer.path) == "a,b\n1,2\n3,4\n"
+
+
+def test_gzip_compression_round_trips(tmp_path):
+    with RawMeasurementWriter(("a", "b"), "compressed", compression="gzip", base_dir=str(tmp_path)) as writer:
+        writer.append_many([(1, 2), (3, 4)])
+    assert writer.path.endswith(".csv.gz")
+    assert _read(writer.path) == "a,b\n1,2\n3,4\n"
+
+
+def test_unknown_compression_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="compression"):
+        RawMeasurementWriter(("a",), "bad", compression="zip", base_dir=str(tmp_path))
+
+
+@pytest.mark.parametrize("backend", ["join", "csv", "numpy"])
+def test_backends_write_the_same_rows(tmp_path, backend):
+    with RawMeasurementWriter(("a", "b"), backend, base_dir=str(tmp_path), backend=backend) as writer:
+        writer.append_many(np.array([[0.1, 2.5], [1e-3, -4.0]]))
+    assert _read(writer.path) == "a,b\n0.1,2.5\n0.001,-4.0\n"
+
+
+def test_save_appends_keep_one_open_handle_and_one_header(tmp_path):
+    try:
+        for rows in ([(1, 2)], [(3, 4)]):
+            path = save_raw_measurements(("a", "b"), rows, "checkpoint", append=True, base_dir=str(tmp_path))
+        assert list(data_saver._OPEN) == [path]
+        assert _read(path) == "a,b\n1,2\n3,4\n"
+        # A plain save replaces the file and releases the open handle
+        save_raw_measurements(("a", "b"), [(5, 6)], "checkpoint", base_dir=str(tmp_path))
+        assert path not in data_saver._OPEN
+        assert _read(path) == "a,b\n5,6\n"
+    finally:
+        data_saver._close_open_writers()
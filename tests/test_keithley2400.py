@@ -0,0 +1,147 @@
+"""
+Keithley 2400 binary transfers against a fake VISA session.
+
+The fake answers like the instrument in REAL,32 mode: an indefinite `#0` block of
+little-endian floats followed by LF, ended by EOI. Decoding goes through pyvisa's
+own `read_binary_values`, so the tests catch missing block sizes.
+"""
+import struct
+
+import numpy as np
+import pytest
+from pyvisa.constants import StatusCode
+from pyvisa.errors import VisaIOError
+from pyvisa.resources.messagebased import MessageBasedResource
+
+from instruments.keithley2400 import Keithley2400SourceMeter
+
+
+def _block(*values: float) -> bytes:
+    return b"#0" + struct.pack(f"<{len(values)}f", *values) + b"\n"
+
+
+class FakeSession:
+    """Just enough of a MessageBasedResource for the Keithley driver."""
+
+    read_binary_values = MessageBasedResource.read_binary_values
+    _read_termination = None  # Binary sessions read until EOI
+    chunk_size = 20 * 1024
+
+    def __init__(self):
+        self.timeout = 10000
+        self.written = []
+        self.responses = []  # Raw replies returned by the next binary reads
+
+    def write(self, command):
+        self.written.append(command)
+
+    def query(self, command):
+        self.written.append(command)
+        return "KEITHLEY INSTRUMENTS INC.,MODEL 2400,0,C30\n" if command == "*IDN?" else "1\n"
+
+    def _read_raw(self, size=None, monitoring_interface=None):
+        return bytearray(self.responses.pop(0))
+
+    def read_bytes(self, count, chunk_size=None, monitoring_interface=None):
+        # The whole message already arrived with _read_raw; asking for more times out
+        if count > 0:
+            raise VisaIOError(StatusCode.error_timeout)
+        return b""
+
+    def close(self):
+        pass
+
+
+class FakeResourceManager:
+    def __init__(self, session):
+        self.session = session
+
+    def open_resource(self, address):
+        return self.session
+
+
+@pytest.fixture
+def session():
+    return FakeSession()
+
+
+@pytest.fixture
+def keithley(session):
+    return Keithley2400SourceMeter(resource_manager=FakeResourceManager(session), suppress_print=True)
+
+
+def test_source_voltage_reads_single_binary_value(keithley, session):
+    session.responses.append(_block(1.25e-3))
+    current = keithley.source_voltage_and_read_current(0.5, 2.0)
+    assert current == pytest.approx(1.25e-3)
+
+
+def test_set_voltage_and_read_decodes_binary_value(keithley, session):
+    keithley.configure_voltage_source(2.0)
+    session.responses.append(_block(-4.0e-6))
+    assert keithley.set_voltage_and_read(0.1) == pytest.approx(-4.0e-6)
+
+
+def test_configured_resistance_reads_binary_value(keithley, session):
+    session.responses.append(_block(1000.0))
+    resistance = keithley.read_resistance_configured(mode="MAN")
+    np.testing.assert_allclose(resistance, [1000.0])
+
+
+def test_configured_resistance_raises_on_truncated_block(keithley, session):
+    session.responses.append(b"#0\x00\x00\n")
+    with pytest.raises(VisaIOError):
+        keithley.read_resistance_configured(mode="MAN")
+    assert session.written[-1] == ":OUTP OFF"
+
+
+def test_sweep_fetches_all_points_from_one_block(keithley, session):
+    expected = np.linspace(0.0, 1e-3, 11, dtype=np.float32)
+    session.responses.append(_block(*expected))
+    currents = keithley.sweep_voltage_linear(0.0, 1.0, 0.1)
+    np.testing.assert_allclose(currents, expected)
+    assert ":TRIG:COUN 11" in session.written
+
+
+def test_sweep_rejects_span_that_is_not_whole_steps(keithley, session):
+    with pytest.raises(ValueError, match="whole number"):
+        keithley.sweep_voltage_linear(0.0, 1.0, 0.6)
+    assert not any(command.startswith(":TRIG:COUN") for command in session.written)
+
+
+def test_initialize_source_delay_is_kept_by_later_configuration(keithley, session):
+    keithley.initialize(source_delay=0.5)
+    keithley.configure_voltage_source(2.0)
+    session.responses.append(_block(1e-3))
+    keithley.source_voltage_and_read_current(0.5, 2.0)
+    delays = [part for message in session.written for part in message.split(";") if part.startswith(":SOUR:DEL")]
+    assert delays == [":SOUR:DEL 0.5"]
+
+
+def test_explicit_delay_overrides_initialize(keithley, session):
+    keithley.initialize(source_delay=0.5)
+    keithley.configure_voltage_source(2.0, delay=0.01)
+    delays = [part for message in session.written for part in message.split(";") if part.startswith(":SOUR:DEL")]
+    assert delays == [":SOUR:DEL 0.5", ":SOUR:DEL 0.01"]
+
+
+def test_write_compound_joins_commands_into_one_message(keithley, session):
+    session.written.clear()
+    keithley._write_compound(":OUTP OFF", None, ":SOUR:FUNC VOLT")
+    assert session.written == [":OUTP OFF;:SOUR:FUNC VOLT"]
+
+
+def test_write_compound_splits_at_message_length(keithley, session):
+    commands = [f":SENS:CURR:RANG {i:.6e}" for i in range(40)]
+    session.written.clear()
+    keithley._write_compound(*commands)
+    assert len(session.written) > 1
+    assert all(len(message) <= Keithley2400SourceMeter.MAX_MESSAGE_LENGTH for message in session.written)
+    assert ";".join(session.written).split(";") == commands
+
+
+def test_write_compound_sends_oversized_command_alone(keithley, session):
+    long_command = ":DISP:TEXT:DATA '" + "x" * 300 + "'"
+    session.written.clear()
+    keithley._write_compound(":OUTP OFF", long_command, ":OUTP ON")
+    assert session.written == [":OUTP OFF", long_command, ":OUTP ON"]
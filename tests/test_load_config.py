@@ -0,0 +1,34 @@
+import os
+
+from utils.load_config import load_config
+
+
+def test_restored_older_yaml_is_not_answered_from_sidecar(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    with open(path, "w") as f:
+        f.write("a: 99\n")
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))  # An old file, as after `cp -p`
+    old_stat = os.stat(path)
+
+    with open(path, "w") as f:
+        f.write("a: 2\n")
+    load_config.cache_clear()
+    assert load_config(path) == {"a": 2}
+    assert os.path.exists(path + ".cache.json")
+
+    # Restore the old contents with their old mtime; the sidecar is newer than both
+    with open(path, "w") as f:
+        f.write("a: 99\n")
+    os.utime(path, ns=(old_stat.st_atime_ns, old_stat.st_mtime_ns))
+    load_config.cache_clear()
+    assert load_config(path) == {"a": 99}
+
+
+def test_sidecar_is_reused_for_unchanged_yaml(tmp_path):
+    path = str(tmp_path / "config.yaml")
+    with open(path, "w") as f:
+        f.write("limits:\n  compliance: 0.01\n")
+    load_config.cache_clear()
+    first = load_config(path)
+    load_config.cache_clear()
+    assert load_config(path) == first == {"limits": {"compliance": 0.01}}
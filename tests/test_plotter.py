@@ -0,0 +1,40 @@
+import os
+
+import numpy as np
+
+from utils.plotter import _decimate, plot_measurements
+
+
+def test_short_trace_is_not_decimated():
+    x = np.arange(100.0)
+    y = np.sin(x)
+    dx, dy = _decimate(x, y, max_points=4000)
+    assert dx is x and dy is y
+
+
+def test_decimation_keeps_narrow_peaks_and_dips():
+    x = np.linspace(1549.0, 1551.0, 100_003)
+    y = np.zeros_like(x)
+    y[12_345] = 5.0   # One-sample peak
+    y[67_890] = -7.0  # One-sample dip
+    dx, dy = _decimate(x, y, max_points=1000)
+    assert len(dx) <= 1000 + 100_003 % 500
+    assert dy.max() == 5.0 and dy.min() == -7.0
+    assert x[12_345] in dx and x[67_890] in dx
+
+
+def test_decimated_points_stay_in_order_and_on_the_trace():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000.0)
+    y = rng.normal(size=x.size)
+    dx, dy = _decimate(x, y, max_points=200)
+    assert np.all(np.diff(dx) > 0)
+    np.testing.assert_array_equal(dy, y[dx.astype(int)])
+
+
+def test_headless_plot_writes_png(tmp_path):
+    results = np.column_stack((np.linspace(0, 1, 50), np.linspace(0, 1, 50) ** 2))
+    path = plot_measurements(("Voltage (V)", "Current (A)"), results, "iv", show=False, base_dir=str(tmp_path))
+    assert path == os.path.join(str(tmp_path), "plots", "iv.png")
+    with open(path, "rb") as f:
+        assert f.read(8) == b"\x89PNG\r\n\x1a\n"
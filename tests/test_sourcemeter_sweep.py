@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from controllers.sourcemeter_sweep import measure_iv_curve
+from instruments.sourcemeter_base import BaseSourceMeter
+
+
+class FakeSourceMeter(BaseSourceMeter):
+    """Source meter whose current is the set voltage in mA."""
+
+    def __init__(self, max_sweep_points=0):
+        self.MAX_SWEEP_POINTS = max_sweep_points
+        self.connected = True
+        self.hardware_sweeps = 0
+
+    def initialize(self, wire_mode=2, source_delay=None, fast_mode=False):
+        pass
+
+    def read_resistance_auto(self, resistance_range=20e3, out=None):
+        raise NotImplementedError
+
+    def read_resistance_configured(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def source_voltage_and_read_current(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def source_current_and_read_voltage(self, *args, **kwargs):
+        raise NotImplementedError
+
+    def configure_voltage_source(self, source_range, **kwargs):
+        return self
+
+    def configure_current_source(self, source_range, **kwargs):
+        return self
+
+    def set_voltage_and_read(self, voltage):
+        return voltage * 1e-3
+
+    def set_current_and_read(self, current):
+        raise NotImplementedError
+
+    def sweep_voltage_linear(self, start, stop, step, **kwargs):
+        self.hardware_sweeps += 1
+        return np.linspace(start, stop, int(round(abs(stop - start) / step)) + 1) * 1e-3
+
+    def turn_off(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_hardware_sweep_within_buffer():
+    smu = FakeSourceMeter(max_sweep_points=2500)
+    _, results = measure_iv_curve(smu, 0.0, 1.0, 0.1)
+    assert smu.hardware_sweeps == 1
+    np.testing.assert_allclose(results[:, 0], np.linspace(0.0, 1.0, 11))
+    np.testing.assert_allclose(results[:, 1], results[:, 0] * 1e-3)
+
+
+def test_long_sweep_falls_back_to_point_by_point():
+    smu = FakeSourceMeter(max_sweep_points=2500)
+    _, results = measure_iv_curve(smu, -1.0, 1.0, 0.0005)
+    assert smu.hardware_sweeps == 0
+    assert len(results) == 4001
+
+
+def test_source_meter_without_hardware_sweep_steps_point_by_point():
+    _, results = measure_iv_curve(FakeSourceMeter(), 0.0, 1.0, 0.25)
+    np.testing.assert_allclose(results[:, 0], [0.0, 0.25, 0.5, 0.75, 1.0])
+
+
+def test_span_not_whole_steps_is_rejected_before_sweeping():
+    smu = FakeSourceMeter(max_sweep_points=2500)
+    with pytest.raises(ValueError, match="whole number"):
+        measure_iv_curve(smu, 0.0, 1.0, 0.6)
+    assert smu.hardware_sweeps == 0
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from utils.sweep import make_axis, sweep_points
+
+
+def test_axis_includes_both_endpoints():
+    axis = make_axis(-1.0, 1.0, 0.1)
+    assert len(axis) == 21
+    assert axis[0] == -1.0 and axis[-1] == 1.0
+
+
+def test_axis_is_not_shortened_by_float_error_in_step():
+    # 0.3 / 0.1 is 2.9999999999999996, which np.arange would turn into 3 points
+    np.testing.assert_allclose(make_axis(0.0, 0.3, 0.1), [0.0, 0.1, 0.2, 0.3])
+
+
+def test_descending_sweep_ignores_step_sign():
+    np.testing.assert_allclose(make_axis(1.0, 0.0, 0.25), [1.0, 0.75, 0.5, 0.25, 0.0])
+    np.testing.assert_allclose(make_axis(1.0, 0.0, -0.25), [1.0, 0.75, 0.5, 0.25, 0.0])
+
+
+def test_zero_span_is_a_single_point():
+    np.testing.assert_allclose(make_axis(0.5, 0.5, 0.1), [0.5])
+
+
+@pytest.mark.parametrize("step", [0.4, 0.6])
+def test_span_not_a_whole_number_of_steps_is_rejected(step):
+    with pytest.raises(ValueError, match="whole number"):
+        make_axis(0.0, 1.0, step)
+
+
+def test_zero_step_is_rejected():
+    with pytest.raises(ValueError, match="non-zero"):
+        sweep_points(0.0, 1.0, 0.0)
+
+
+def test_points_sit_at_start_plus_k_steps():
+    axis = make_axis(1550.0, 1551.0, 0.05)
+    np.testing.assert_allclose(axis, 1550.0 + 0.05 * np.arange(sweep_points(1550.0, 1551.0, 0.05)))
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from utils import visa_utils
+
+
+class FakeInstrument:
+    def __init__(self, address):
+        self.address = address
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def no_visa_library(monkeypatch):
+    monkeypatch.setattr(visa_utils, "default_rm", lambda: None)
+
+
+def _tracking_factory(active, peaks, lock):
+    def factory(address):
+        board = visa_utils._bus_key(address)
+        with lock:
+            active[board] = active.get(board, 0) + 1
+            peaks[board] = max(peaks.get(board, 0), active[board])
+        time.sleep(0.05)
+        with lock:
+            active[board] -= 1
+        return FakeInstrument(address)
+    return factory
+
+
+def test_same_gpib_board_connects_serially_other_buses_overlap():
+    active, peaks, lock = {}, {}, threading.Lock()
+    factory = _tracking_factory(active, peaks, lock)
+    start = time.monotonic()
+    connected = visa_utils.connect_instruments({
+        "smu": ("GPIB0::24::INSTR", factory),
+        "mm": ("GPIB0::20::INSTR", factory),
+        "scope": ("TCPIP0::10.0.0.5::INSTR", factory),
+    })
+    elapsed = time.monotonic() - start
+    assert set(connected) == {"smu", "mm", "scope"}
+    assert peaks["GPIB0"] == 1
+    assert elapsed < 0.14  # GPIB0 pair (2 x 50 ms) overlapped with the TCPIP instrument
+
+
+def test_failed_connection_closes_the_others():
+    def broken(address):
+        raise RuntimeError("no listener")
+
+    opened = []
+
+    def factory(address):
+        opened.append(FakeInstrument(address))
+        return opened[-1]
+
+    with pytest.raises(RuntimeError, match="no listener"):
+        visa_utils.connect_instruments({
+            "smu": ("GPIB0::24::INSTR", factory),
+            "mm": ("GPIB1::20::INSTR", broken),
+        })
+    assert opened and all(instrument.closed for instrument in opened)
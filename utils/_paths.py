@@ -0,0 +1,19 @@
+"""
+Output directory handling shared by the data saver and the plotter.
+
+Directories are created at most once per process, so saving many intermediate
+files does not repeat the `os.makedirs` stat calls for every file.
+"""
+import os
+from typing import Optional, Set
+
+_ENSURED_DIRS: Set[str] = set()
+
+
+def output_dir(subdir: str, base_dir: Optional[str] = None) -> str:
+    """Return `base_dir/subdir` (the working directory by default), creating it on first use."""
+    path = os.path.join(base_dir or os.getcwd(), subdir)
+    if path not in _ENSURED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+    return path
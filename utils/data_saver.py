@@ -1,23 +1,322 @@
+import atexit
+import csv
+import gzip
 import os
-from typing import List, Tuple
+import queue
+import threading
+from typing import Dict, Iterable, List, Literal, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from utils._paths import output_dir
+
+def _format_row(row) -> str:
+    return ",".join(map(str, row))
+
+
+def _open_text(path: str, compression: Optional[str], mode: str = 'w'):
+    """Open `path` for text writing (mode 'w') or appending (mode 'a'), optionally through a compressor."""
+    if compression is None:
+        return open(path, mode, buffering=1 << 20, newline='')
+    if compression == "gzip":
+        # Level 1 keeps the CPU cost low; CSV digits still compress several times over
+        return gzip.open(path, mode + 't', compresslevel=1, newline='')
+    try:
+        import lz4.frame
+    except ImportError as e:
+        raise ImportError("lz4 compression requires the 'lz4' package (pip install lz4).") from e
+    return lz4.frame.open(path, mode + 't', newline='')
+
+
+_EXTENSIONS = {None: ".csv", "gzip": ".csv.gz", "lz4": ".csv.lz4"}
+
+Backend = Literal["join", "csv", "numpy"]
+_BACKENDS = ("join", "csv", "numpy")
+
+# Writers kept open by save_raw_measurements(append=True), keyed by file path
+_OPEN: Dict[str, "RawMeasurementWriter"] = {}
+
+# AsyncCSVWriter threads not closed yet; daemon threads would otherwise die with rows queued
+_ASYNC: Set["AsyncCSVWriter"] = set()
+
+
+def _raw_path(filename: str, compression: Optional[str], base_dir: Optional[str] = None) -> str:
+    if compression not in _EXTENSIONS:
+        raise ValueError(f"Unsupported compression '{compression}'. Use None, 'gzip' or 'lz4'.")
+    return os.path.join(output_dir('data/raw', base_dir), f"{filename}{_EXTENSIONS[compression]}")
+
+
+@atexit.register
+def _close_open_writers():
+    while _ASYNC:
+        writer = _ASYNC.pop()
+        try:
+            writer.close()
+        except Exception as e:
+            print(f"Failed to finish {writer.path}: {e}")
+    while _OPEN:
+        _OPEN.popitem()[1].close()
+
+
+class RawMeasurementWriter:
+    """
+    Incremental CSV writer for raw measurements under `data/raw`.
+
+    Rows are formatted as they arrive and kept in a small string buffer that is
+    written out every `flush_rows` rows, so a long sweep can be saved while it
+    runs without holding every measurement in memory.
+
+    Args:
+        headers: Column names written as the first line.
+        filename: File name without extension.
+        flush_rows: Number of buffered rows that triggers a write.
+        compression: None for plain CSV, or "gzip"/"lz4" to write `.csv.gz`/`.csv.lz4`.
+        append: Add to an existing file instead of replacing it. The header is only
+            written if the file is new or empty.
+        base_dir: Directory holding `data/raw`. Defaults to the working directory.
+        backend: How rows are formatted. "join" joins `str` values in Python, "csv" uses
+            the C `csv.writer` (quotes mixed-type rows correctly), and "numpy" passes
+            blocks of float rows to `np.savetxt`.
+    """
+
+    def __init__(self, headers: Tuple[str, ...], filename: str = 'sweep_data', flush_rows: int = 4096,
+                 compression: Optional[str] = None, append: bool = False, base_dir: Optional[str] = None,
+                 backend: Backend = "join"):
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unsupported backend '{backend}'. Use 'join', 'csv' or 'numpy'.")
+        self.path = _raw_path(filename, compression, base_dir)
+        self.flush_rows = flush_rows
+        self.backend = backend
+        self._buf: List[str] = []
+        # Checked before opening: compressors may write their own header on open
+        new_file = not append or not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        self._file = _open_text(self.path, compression, 'a' if append else 'w')
+        self._csv = csv.writer(self._file, lineterminator="\n") if backend == "csv" else None
+        if new_file:
+            self._file.write(",".join(headers) + "\n")
+
+    def append(self, row: Sequence[float]):
+        """Add one measurement row."""
+        if self._csv is not None:
+            self._csv.writerow(row)
+            return
+        self._buf.append(_format_row(row))
+        if len(self._buf) >= self.flush_rows:
+            self.flush()
+
+    def append_many(self, rows: Iterable[Sequence[float]]):
+        """Add several measurement rows at once."""
+        if self.backend == "numpy":
+            self.flush()  # Keep rows added with append() ahead of this block
+            np.savetxt(self._file, np.asarray(rows, dtype=np.float64), fmt='%s', delimiter=',')
+            return
+        if hasattr(rows, 'tolist'):
+            rows = rows.tolist()  # Python floats format faster than NumPy scalars
+        if self._csv is not None:
+            self._csv.writerows(rows)
+            return
+        self._buf.extend(map(_format_row, rows))
+        if len(self._buf) >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered rows to the file."""
+        if self._buf:
+            self._file.write("\n".join(self._buf) + "\n")
+            self._buf.clear()
+
+    def close(self):
+        """Write the remaining rows and close the file."""
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+_STOP = object()
+
+
+class AsyncCSVWriter(threading.Thread):
+    """
+    RawMeasurementWriter running on its own thread.
+
+    The acquisition loop only puts rows on a queue. The writer thread drains
+    them in batches of up to `batch` rows and writes each batch at once, so disk
+    latency never lands on the measurement cadence. One thread per file keeps
+    the rows in order. Every batch is flushed to the OS, so written rows survive
+    a crash of the acquisition script. Call `close()` (or use it as a context
+    manager) to write the remaining rows; it re-raises any error the writer
+    thread hit. Writers still open at interpreter exit are closed then.
+
+    Args:
+        headers: Column names written as the first line.
+        filename: File name without extension.
+        compression: None, "gzip" or "lz4", as for RawMeasurementWriter.
+        base_dir: Directory holding `data/raw`. Defaults to the working directory.
+        batch: Maximum number of rows written per batch.
+        maxsize: Queue length at which `put()` blocks until the writer catches up.
+    """
+
+    def __init__(self, headers: Tuple[str, ...], filename: str = 'sweep_data',
+                 compression: Optional[str] = None, base_dir: Optional[str] = None,
+                 batch: int = 1024, maxsize: int = 10_000):
+        super().__init__(name=f"AsyncCSVWriter-{filename}", daemon=True)
+        self._writer = RawMeasurementWriter(headers, filename, flush_rows=batch,
+                                            compression=compression, base_dir=base_dir)
+        self.path = self._writer.path
+        self.batch = batch
+        self.q: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.error: Optional[BaseException] = None
+        self._closed = False
+        _ASYNC.add(self)
+        self.start()
+
+    def put(self, row: Sequence[float]):
+        """Queue one measurement row for writing."""
+        if self._closed:
+            raise RuntimeError(f"Cannot write to {self.path}: writer is closed.")
+        if self.error is not None:
+            raise self.error
+        self.q.put(row)
+
+    def run(self):
+        get, get_nowait = self.q.get, self.q.get_nowait
+        done = False
+        try:
+            while not done:
+                rows = [get()]
+                while len(rows) < self.batch:
+                    try:
+                        rows.append(get_nowait())
+                    except queue.Empty:
+                        break
+                if rows[-1] is _STOP:
+                    rows.pop()
+                    done = True
+                if self.error is None:
+                    try:
+                        self._writer.append_many(rows)
+                        self._writer.flush()
+                        self._writer._file.flush()
+                    except Exception as e:
+                        self.error = e  # Keep draining so put() never blocks on a full queue
+        finally:
+            try:
+                self._writer.close()
+            except Exception as e:
+                self.error = self.error or e
+
+    def close(self):
+        """Write all queued rows, stop the thread and close the file."""
+        self._closed = True
+        _ASYNC.discard(self)
+        if self.is_alive():
+            self.q.put(_STOP)
+            self.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
 
 def save_raw_measurements(
     headers: Tuple[str, ...],
     data: List[Tuple[float, ...]],
     filename: str = 'sweep_data',
+    compression: Optional[str] = None,
+    append: bool = False,
+    base_dir: Optional[str] = None,
+    backend: Backend = "join",
 ) -> str:
-    if not data:
+    """
+    Save measurement rows as CSV under `data/raw`.
+
+    With `append=True` the rows are added to the file and its handle stays open, so
+    repeated partial dumps of a running sweep neither reopen the file nor rewrite
+    the header. Open handles are closed when the process exits. `base_dir` replaces
+    the working directory as the parent of `data/raw`. `backend` selects the row
+    formatter, see RawMeasurementWriter.
+    """
+    if len(data) == 0:
         print("No results to plot.")
         return ""
 
-    plots_dir = os.path.join(os.getcwd(), 'data/raw')
-    os.makedirs(plots_dir, exist_ok=True)
-    data_path = os.path.join(plots_dir, f"{filename}.csv")
+    path = _raw_path(filename, compression, base_dir)
+    writer = _OPEN.pop(path, None)
+    if not append:
+        if writer is not None:
+            writer.close()
+        with RawMeasurementWriter(headers, filename, compression=compression, base_dir=base_dir,
+                                  backend=backend) as writer:
+            writer.append_many(data)
+        print(f"Data saved as {writer.path}")
+        return writer.path
+
+    if writer is None:
+        writer = RawMeasurementWriter(headers, filename, compression=compression, append=True, base_dir=base_dir,
+                                      backend=backend)
+    _OPEN[path] = writer
+    writer.append_many(data)
+    writer.flush()
+    writer._file.flush()  # Checkpoints are for crash safety, so hand the rows to the OS now
+
+    print(f"Data appended to {writer.path}")
+    return writer.path
+
+def save_raw_npz(
+    headers: Tuple[str, ...],
+    data: List[Tuple[float, ...]],
+    filename: str = 'sweep_data',
+    base_dir: Optional[str] = None,
+) -> str:
+    """
+    Save measurement rows as a compressed NumPy archive under `data/raw`.
+
+    Floats are stored in binary, so no time is spent formatting them as text.
+    Load with `np.load(path)`: `data` holds the (N, k) float64 array and
+    `headers` the column names. Keep CSV for files meant to be read by eye.
+    """
+    if len(data) == 0:
+        print("No results to save.")
+        return ""
+
+    path = os.path.join(output_dir('data/raw', base_dir), f"{filename}.npz")
+    np.savez_compressed(path, data=np.asarray(data, dtype=np.float64), headers=np.array(headers))
+
+    print(f"Data saved as {path}")
+    return path
+
+
+def save_raw_parquet(
+    headers: Tuple[str, ...],
+    data: List[Tuple[float, ...]],
+    filename: str = 'sweep_data',
+    base_dir: Optional[str] = None,
+) -> str:
+    """Save measurement rows as a zstd-compressed Parquet table under `data/raw`, one column per header."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output requires the 'pyarrow' package (pip install pyarrow).") from e
+
+    if len(data) == 0:
+        print("No results to save.")
+        return ""
 
-    with open(data_path, 'w') as f:
-        f.write(",".join(headers) + "\n")
-        for row in data:
-            f.write(",".join(str(value) for value in row) + "\n")
+    arr = np.asarray(data, dtype=np.float64)
+    table = pa.table({header: arr[:, i] for i, header in enumerate(headers)})
+    path = os.path.join(output_dir('data/raw', base_dir), f"{filename}.parquet")
+    pq.write_table(table, path, compression='zstd', compression_level=1)
 
-    print(f"Data saved as {data_path}")
-    return data_path
+    print(f"Data saved as {path}")
+    return path
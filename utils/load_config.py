@@ -1,16 +1,101 @@
+import hashlib
+import os
+import tempfile
 import yaml  # Import the PyYAML library for YAML file handling
 
+# Prefer the C-accelerated loader when PyYAML was built with libyaml
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# JSON sidecars load much faster than YAML; orjson is optional
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    import json
+
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+# Parsed configs keyed by absolute path, with the file's mtime at load time
+_CACHE = {}
+
+def _write_sidecar(cache_path, digest, config):
+    """Store `config` as JSON next to its YAML file, if JSON represents it exactly."""
+    try:
+        # YAML allows non-string keys, dates, NaN etc. that JSON would silently change
+        if _json_loads(_json_dumps(config)) != config:
+            return
+        data = _json_dumps({"source_sha256": digest, "config": config})
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(cache_path) or '.', suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, cache_path)  # Atomic, so a concurrent reader never sees half a file
+    except (TypeError, ValueError, OSError):
+        pass
+
 def load_config(path):
     """
     Load a YAML configuration file from the given path.
 
+    Parsed configurations are cached per file and reused until the file's
+    modification time or size changes, so repeated calls do not re-parse the YAML.
+    The cached dictionary is shared between calls; copy it before modifying.
+
+    Across runs, the parsed configuration is kept in a `<path>.cache.json`
+    sidecar together with the SHA-256 of the YAML it came from. It is only
+    used while that hash matches, so a restored older YAML (whose mtime may
+    predate the sidecar) is never answered with stale values.
+
     Args:
         path (str): The file path to the YAML config file.
 
     Returns:
         dict: The configuration loaded as a Python dictionary.
     """
-    # Open the file at the specified path in read mode
-    with open(path, 'r') as f:
-        # Parse the YAML file and return the resulting dictionary
-        return yaml.safe_load(f)
+    # Return the cached result if the file has not changed since it was parsed
+    key = os.path.abspath(path)
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+    hit = _CACHE.get(key)
+    if hit and hit[0] == version:
+        return hit[1]
+
+    # Open the file at the specified path in binary mode; hashing it is far cheaper than parsing
+    with open(path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+
+    # Use the JSON sidecar from an earlier run if it was built from exactly this YAML
+    cache_path = path + ".cache.json"
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = _json_loads(f.read())
+        if isinstance(cached, dict) and cached.get("source_sha256") == digest:
+            config = cached["config"]
+            _CACHE[key] = (version, config)
+            return config
+    except (OSError, ValueError, KeyError):
+        pass
+
+    # Parse the YAML file into a dictionary
+    config = yaml.load(source, Loader=_Loader)
+    _write_sidecar(cache_path, digest, config)
+    _CACHE[key] = (version, config)
+    return config
+
+def _cache_clear():
+    """Drop all cached configurations."""
+    _CACHE.clear()
+
+load_config.cache_clear = _cache_clear
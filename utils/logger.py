@@ -1,5 +1,15 @@
 import logging
+import logging.handlers
 import sys
+from collections import defaultdict
+
+# This project's format never shows thread or process info, so skip collecting it for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+_DATEFMT = "%Y-%m-%d %H:%M:%S"
 
 class ColorFormatter(logging.Formatter):
     COLORS = {
@@ -11,28 +21,44 @@ class ColorFormatter(logging.Formatter):
     }
     RESET = '\033[0m'
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Color prefix and reset suffix per level, built once instead of on every record
+        self._wrap = defaultdict(
+            lambda: (self.RESET, self.RESET),
+            {level: (color, self.RESET) for level, color in self.COLORS.items()}
+        )
+
     def format(self, record):
-        color = self.COLORS.get(record.levelname, self.RESET)
-        message = super().format(record)
-        return f"{color}{message}{self.RESET}"
+        prefix, suffix = self._wrap[record.levelname]
+        return prefix + super().format(record) + suffix
+
 
-def setup_logger(name: str, level=logging.INFO) -> logging.Logger:
+# One formatter and console handler shared by every logger from setup_logger
+_FORMATTER = ColorFormatter(fmt=_FORMAT, datefmt=_DATEFMT)
+_HANDLER = logging.StreamHandler(sys.stdout)
+_HANDLER.setFormatter(_FORMATTER)
+_FILE_FORMATTER = logging.Formatter(fmt=_FORMAT, datefmt=_DATEFMT)
+
+def setup_logger(name: str, level=logging.INFO, log_file: str = None) -> logging.Logger:
     """
     Create and return a color-enabled logger with a given name and level.
-    """
-    formatter = ColorFormatter(
-        fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
 
+    If `log_file` is given, records are also written to that file through a
+    memory buffer that flushes every 1024 records or on the first ERROR, so a
+    sweep does not stall on a disk write for every logged point.
+    """
     logger = logging.getLogger(name)
     logger.setLevel(level)
     logger.propagate = False
 
     if not logger.handlers:
-        logger.addHandler(handler)
+        logger.addHandler(_HANDLER)
+        if log_file:
+            file_handler = logging.FileHandler(log_file)
+            file_handler.setFormatter(_FILE_FORMATTER)
+            logger.addHandler(logging.handlers.MemoryHandler(
+                capacity=1024, flushLevel=logging.ERROR, target=file_handler
+            ))
 
     return logger
@@ -1,48 +1,80 @@
 import os
-import matplotlib.pyplot as plt
-from typing import List, Tuple
+import numpy as np
+from typing import List, Optional, Tuple
+from utils._paths import output_dir
+
+def _decimate(x: np.ndarray, y: np.ndarray, max_points: int = 4000) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a trace to about `max_points` points for display.
+
+    The trace is split into equal buckets and only the minimum and maximum of each
+    bucket are kept, so narrow peaks and dips survive the reduction.
+    """
+    n = x.size
+    if n <= max_points:
+        return x, y
+    buckets = max_points // 2
+    size = n // buckets
+    used = buckets * size
+    blocks = y[:used].reshape(buckets, size)
+    extremes = np.sort(np.stack((blocks.argmin(axis=1), blocks.argmax(axis=1)), axis=1), axis=1)
+    idx = (np.arange(buckets)[:, None] * size + extremes).ravel()
+    idx = np.concatenate((idx, np.arange(used, n)))
+    return x[idx], y[idx]
 
 def plot_measurements(
     headers: Tuple[str, str],
     results: List[Tuple[float, float]],
     figure_name: str = 'sweep_plot',
-    show: bool = True
+    show: bool = True,
+    base_dir: Optional[str] = None
 ) -> str:
     """
     Plots the results from the laser sweep.
 
+    Sweeps with more points than the figure can show are reduced to their
+    per-bucket minima and maxima before plotting.
+
     Args:
-        results: A list of (wavelength, power) tuples.
+        results: A list of (wavelength, power) tuples or an (N, 2) array.
         figure_name: Name for the saved plot file (without extension).
         show: Whether to display the plot interactively.
+        base_dir: Directory holding `plots`. Defaults to the working directory.
 
     Returns:
         The path to the saved plot file.
     """
-    if not results:
+    if len(results) == 0:
         print("No results to plot.")
         return ""
 
     xlabel, ylabel = headers
-    wavelengths, powers = zip(*results)
+    arr = np.asarray(results, dtype=np.float64)
+    wavelengths, powers = _decimate(arr[:, 0], arr[:, 1])
 
-    plt.figure(figsize=(8, 5))
-    plt.plot(wavelengths, powers)
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.title(figure_name)
-    plt.grid(True)
-    plt.tight_layout()
+    if show:
+        import matplotlib.pyplot as plt  # Only needed to display; importing pyplot dominates short scripts
+        fig = plt.figure(figsize=(8, 5))
+    else:
+        # Headless: an Agg canvas stays out of pyplot's global figure registry and is thread-safe
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=(8, 5))
+        FigureCanvasAgg(fig)
 
-    plots_dir = os.path.join(os.getcwd(), 'plots')
-    os.makedirs(plots_dir, exist_ok=True)
-    plot_path = os.path.join(plots_dir, f"{figure_name}.png")
-    plt.savefig(plot_path)
+    ax = fig.add_subplot(111)
+    ax.plot(wavelengths, powers, linewidth=0.8)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(figure_name)
+    ax.grid(True)
+    fig.tight_layout()
+
+    plot_path = os.path.join(output_dir('plots', base_dir), f"{figure_name}.png")
+    fig.savefig(plot_path)
 
     if show:
         plt.show()
-    else:
-        plt.close()
 
     print(f"Plot saved as {plot_path}")
     return plot_path
@@ -0,0 +1,51 @@
+import numpy as np
+
+def sweep_points(start: float, stop: float, step: float) -> int:
+    """
+    Count the points of a sweep from `start` to `stop` in steps of `step`, both endpoints included.
+
+    The span must be a whole number of steps (to within floating-point error), so
+    the sweep lands exactly on `stop` and every point sits at `start + k * step`.
+
+    Args:
+        start (float): First value of the sweep.
+        stop (float): Last value of the sweep.
+        step (float): Spacing between points. Only its magnitude is used.
+
+    Returns:
+        int: Number of sweep points.
+
+    Raises:
+        ValueError: If `step` is zero or the span is not a whole number of steps.
+    """
+    if step == 0:
+        raise ValueError("Sweep step must be non-zero.")
+    steps = abs(stop - start) / abs(step)
+    whole = round(steps)
+    if abs(steps - whole) > 1e-6:
+        raise ValueError(
+            f"Sweep span {start} → {stop} is not a whole number of {abs(step)} steps; "
+            f"adjust the step or the end point."
+        )
+    return int(whole) + 1
+
+def make_axis(start: float, stop: float, step: float) -> np.ndarray:
+    """
+    Build a sweep axis from `start` to `stop` that always includes both endpoints.
+
+    The point count comes from `sweep_points`, so floating-point error in `step`
+    cannot add or drop the last point the way `np.arange` can, and a span that is
+    not a whole number of steps is rejected rather than silently re-spaced.
+
+    Args:
+        start (float): First value of the sweep.
+        stop (float): Last value of the sweep.
+        step (float): Spacing between points. Only its magnitude is used.
+
+    Returns:
+        np.ndarray: Evenly spaced values from `start` to `stop`.
+
+    Raises:
+        ValueError: If `step` is zero or the span is not a whole number of steps.
+    """
+    return np.linspace(start, stop, sweep_points(start, stop, step))
@@ -1,4 +1,8 @@
 import pyvisa
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+from instruments._rm import default_rm
 from utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -7,26 +11,91 @@ def list_visa_resources():
     """
     Lists all available VISA resources connected to the system.
 
+    Uses the process-wide default resource manager, so repeated calls do not
+    reload the VISA library.
+
     Returns:
-        list: A list of VISA resource strings.
+        tuple: The VISA resource strings.
     """
     try:
-        rm = pyvisa.ResourceManager()
-        resources = rm.list_resources()
+        resources = default_rm().list_resources()
         
         if resources:
-            logger.info("Available VISA Resources:")
-            for resource in resources:
-                logger.info(f"  - {resource}")
+            logger.info("Available VISA Resources:\n" + "\n".join(f"  - {resource}" for resource in resources))
         else:
             logger.warning("No VISA resources found.")
         
-        return list(resources)
+        return resources
     
     except pyvisa.VisaIOError as e:
         logger.error(f"[VISA Error] {e}")
-        return []
+        return ()
     
     except Exception as e:
         logger.error(f"[Unexpected Error] {e}")
-        return []
+        return ()
+
+
+def _bus_key(address: str) -> str:
+    """Return the shared bus an address talks over: the GPIB board, or the address itself."""
+    interface = address.split("::", 1)[0].upper()
+    return interface if interface.startswith("GPIB") else address.upper()
+
+
+def _connect_serially(group):
+    connected, error = {}, None
+    for name, address, factory in group:
+        try:
+            connected[name] = factory(address)
+        except Exception as e:
+            logger.error(f"Failed to connect {name} at {address}: {e}")
+            error = error or e
+    return connected, error
+
+
+def connect_instruments(instruments: Dict[str, Tuple[str, Callable[[str], object]]]) -> Dict[str, object]:
+    """
+    Connects several instruments, overlapping the ones on different buses.
+
+    Instruments are grouped by the bus their address uses: all addresses on one GPIB
+    board form one group, any other address (TCPIP, USB, serial port) its own. Groups
+    connect concurrently, while the instruments of a group connect one after another,
+    so two sessions never talk over the same GPIB board at once. That is safe with
+    every VISA backend, including pyvisa-py.
+
+    Args:
+        instruments (dict): Mapping of instrument name to an (address, factory) pair, where the
+            factory opens the instrument at that address, e.g. a driver class.
+
+    Returns:
+        dict: Mapping of instrument name to the connected instrument.
+
+    Raises:
+        Exception: Re-raises the first connection error after closing the instruments that did connect.
+
+    Example:
+        connect_instruments({
+            "sourcemeter": ("GPIB0::24::INSTR", Keithley2400SourceMeter),
+            "multimeter": ("GPIB0::20::INSTR", Agilent8163Multimeter),
+        })
+    """
+    # Create the shared resource manager here; lru_cache does not stop two threads building it at once
+    default_rm()
+
+    groups = defaultdict(list)
+    for name, (address, factory) in instruments.items():
+        groups[_bus_key(address)].append((name, address, factory))
+
+    with ThreadPoolExecutor(max_workers=max(1, len(groups))) as executor:
+        results = list(executor.map(_connect_serially, groups.values()))
+
+    connected, error = {}, None
+    for group_connected, group_error in results:
+        connected.update(group_connected)
+        error = error or group_error
+
+    if error:
+        for instrument in connected.values():
+            instrument.close()
+        raise error
+    return connected